@@ -0,0 +1,85 @@
+"""
+Gunicorn configuration for production serving.
+
+    gunicorn -c python:app.gunicorn_conf app.wsgi
+
+The application is imported once in the master and warmed up there, then the
+heap is frozen so forked workers share those pages copy-on-write. With
+persistent or pooled database connections each worker opens its own right
+after the fork.
+
+More than one worker needs a cache shared between processes, the server
+refuses to start with the default in-memory one. It also needs
+PROMETHEUS_MULTIPROC_DIR, otherwise a scrape only sees the worker that
+answered it.
+"""
+import logging
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+# Requests are mostly waiting on PostgreSQL, two workers per core keep the
+# CPUs busy
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * (os.cpu_count() or 1) + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+preload_app = True
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+
+logger = logging.getLogger('gunicorn.error')
+
+
+def on_starting(server):
+    # Samples left by a previous run would be summed into the new one
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def when_ready(server):
+    from django.db import connections
+    from core.cache import is_process_local
+    from core.warmup import freeze_heap, warm_up
+
+    if server.cfg.workers > 1 and is_process_local():
+        # Cache versions, list ETags and revoked tokens would only be seen by
+        # the worker that changed them
+        raise RuntimeError(
+            'CACHE_BACKEND keeps a separate cache in each of the %s workers, configure a shared one such as '
+            'django.core.cache.backends.db.DatabaseCache (after manage.py createcachetable) or run a single '
+            'worker' % server.cfg.workers
+        )
+
+    if server.cfg.workers > 1 and not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Checked here and not set by default, prometheus_client reads it when
+        # the preloaded app imports it
+        raise RuntimeError(
+            'PROMETHEUS_MULTIPROC_DIR is not set, the metrics of the %s workers would not be combined, point it '
+            'at a writable directory or run a single worker' % server.cfg.workers
+        )
+
+    timings = warm_up()
+    # Sockets opened here would be shared by every worker
+    connections.close_all()
+    freeze_heap()
+    logger.info('Warm-up done in %s ms: %s', round(sum(timings.values()), 2), timings)
+
+
+def post_fork(server, worker):
+    from django.db import DatabaseError
+    from core.warmup import connect
+
+    try:
+        connect(threads=server.cfg.threads)
+    except DatabaseError as error:
+        # The first request retries, the readiness probe reports the outage
+        logger.warning('Worker %s could not connect to the database: %s', worker.pid, error)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -48,6 +48,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.QueryCountMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -83,13 +86,43 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# DB_POOL_MODE selects how connections are reused:
+# - none: a new connection per request
+# - persistent: connections live for DB_CONN_MAX_AGE seconds and are health
+#   checked before their first use in a request
+# - pool: connections are borrowed from an in-process pool for each request
+
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'none')
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'django.db.backends.postgresql' if DB_POOL_MODE == 'none' else 'core.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASS')
+        'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)) if DB_POOL_MODE == 'persistent' else 0,
+        'POOL': {
+            'ENABLED': DB_POOL_MODE == 'pool',
+            'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'MAX_OVERFLOW': int(os.environ.get('DB_POOL_MAX_OVERFLOW', 10)),
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'RECYCLE': int(os.environ.get('DB_POOL_RECYCLE', 3600)),
+            'PRE_PING': int(os.environ.get('DB_POOL_PRE_PING', 10)),
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# The default keeps entries in each process, deployments running several
+# workers must point CACHE_BACKEND at a shared cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
@@ -139,8 +172,99 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# API_JSON selects the JSON renderer and parser: 'orjson' or 'standard'
+API_JSON = os.environ.get('API_JSON', 'orjson')
+
+JSON_CLASSES = {
+    'orjson': ('core.renderers.ORJSONRenderer', 'core.renderers.ORJSONParser'),
+    'standard': ('rest_framework.renderers.JSONRenderer', 'rest_framework.parsers.JSONParser'),
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        JSON_CLASSES[API_JSON][0],
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        JSON_CLASSES[API_JSON][1],
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
-CORS_ORIGIN_ALLOW_ALL = True
\ No newline at end of file
+CORS_ORIGIN_ALLOW_ALL = True
+
+# Requests running more SQL queries than this are logged as warnings
+QUERY_BUDGET = int(os.environ.get('QUERY_BUDGET', 20))
+
+# Directory holding the OpenAPI schema written by manage.py build_schema.
+# When empty, or missing a format, the schema is generated on its first
+# request and kept in memory
+OPENAPI_SCHEMA_DIR = os.environ.get('OPENAPI_SCHEMA_DIR', '')
+
+# The readiness probe checks the database at most once per
+# READINESS_CACHE_TTL seconds per process, and reports itself degraded when
+# the round-trip takes longer than READINESS_DB_LATENCY_THRESHOLD ms
+READINESS_CACHE_TTL = float(os.environ.get('READINESS_CACHE_TTL', 5))
+READINESS_DB_LATENCY_THRESHOLD = float(os.environ.get('READINESS_DB_LATENCY_THRESHOLD', 100))
+
+# Requests with an X-Profile header get a Server-Timing breakdown: staff
+# users may send 'timing', anyone may send a value signed by manage.py
+# profile_header for at most PROFILING_SIGNATURE_MAX_AGE seconds. Signed
+# 'cprofile' requests also write a cProfile dump to PROFILING_DIR, when set
+PROFILING_DIR = os.environ.get('PROFILING_DIR', '')
+PROFILING_SIGNATURE_MAX_AGE = int(os.environ.get('PROFILING_SIGNATURE_MAX_AGE', 3600))
+
+# Category lookups on order writes are served from an in-process cache
+CATEGORY_CACHE_SIZE = int(os.environ.get('CATEGORY_CACHE_SIZE', 1024))
+CATEGORY_CACHE_TTL = int(os.environ.get('CATEGORY_CACHE_TTL', 300))
+# Clients may reuse the category list for this many seconds before
+# revalidating it with its ETag
+CATEGORY_LIST_MAX_AGE = int(os.environ.get('CATEGORY_LIST_MAX_AGE', 0))
+
+# Bulk order creation limits
+ORDER_BULK_MAX_ITEMS = int(os.environ.get('ORDER_BULK_MAX_ITEMS', 5000))
+ORDER_BULK_BATCH_SIZE = int(os.environ.get('ORDER_BULK_BATCH_SIZE', 500))
+
+# The order list reads plain column values instead of model instances
+ORDER_LIST_PROJECTION = os.environ.get('ORDER_LIST_PROJECTION', 'true').lower() == 'true'
+
+# Unfiltered admin listings of tables with at least this many rows, by the
+# planner statistics, show an estimated count instead of running COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get('ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000))
+
+# Rows fetched per round-trip by the streaming order export
+ORDER_EXPORT_CHUNK_SIZE = int(os.environ.get('ORDER_EXPORT_CHUNK_SIZE', 2000))
+
+# Authenticated tokens are cached in the shared cache and, for a shorter time,
+# in process; the local TTL bounds how long another worker may honour a
+# revoked token. A process-local CACHE_BACKEND is not shared, so it keeps
+# tokens for the local TTL only
+AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE', 10000))
+AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', 300))
+AUTH_CACHE_LOCAL_TTL = int(os.environ.get('AUTH_CACHE_LOCAL_TTL', 5))
+
+# Logins hashing or waiting for a hashing thread at once, counted across every
+# server process; further ones are answered with 503 instead of piling up
+LOGIN_HASH_SLOTS = int(os.environ.get('LOGIN_HASH_SLOTS', 3 * (os.cpu_count() or 2)))
+# Hashing threads per process. Gunicorn already runs a process per core, more
+# threads only matter with several request threads per worker
+LOGIN_HASH_WORKERS = int(os.environ.get('LOGIN_HASH_WORKERS', 1))
+
+# Threads serving database work for the async order endpoints, each one
+# holds its own database connection
+ASYNC_DB_WORKERS = int(os.environ.get('ASYNC_DB_WORKERS', 8))
+
+# Background jobs are retried up to JOB_MAX_ATTEMPTS times, waiting
+# JOB_RETRY_BACKOFF * 2 ** (attempt - 1) seconds, at most JOB_RETRY_BACKOFF_MAX.
+# Jobs running longer than JOB_LOCK_TIMEOUT seconds are assumed to belong to
+# a dead worker and queued again
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+JOB_RETRY_BACKOFF = float(os.environ.get('JOB_RETRY_BACKOFF', 5))
+JOB_RETRY_BACKOFF_MAX = float(os.environ.get('JOB_RETRY_BACKOFF_MAX', 3600))
+JOB_LOCK_TIMEOUT = int(os.environ.get('JOB_LOCK_TIMEOUT', 600))
+
+# Order writes queue an order.changed job for side effects to run off the
+# request path
+ORDER_CHANGE_JOBS = os.environ.get('ORDER_CHANGE_JOBS', 'false').lower() == 'true'
@@ -13,18 +13,19 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
+from drf_spectacular.views import SpectacularSwaggerView
 from django.contrib import admin
 from django.urls import include, path
-from app.views import health_check
+from core.schema import CachedSchemaView
+from app.views import health_check, metrics_view, readiness_check
 
 urlpatterns = [
     path('health-check/', health_check, name='health-check'),
+    path('health-check/live/', health_check, name='liveness'),
+    path('health-check/ready/', readiness_check, name='readiness'),
+    path('metrics/', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
+    path('api/schema/', CachedSchemaView.as_view(), name='api-schema'),
     path(
         'api/docs/',
         SpectacularSwaggerView.as_view(url_name='api-schema'),
@@ -1,8 +1,24 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from core import health, metrics
+from core.backends.postgresql.base import pool_stats
 
 
-def health_check(_request):
+async def health_check(_request):
     status = {
         'Status': '✅',
     }
-    return JsonResponse(status)
\ No newline at end of file
+    stats = pool_stats()
+    if stats:
+        status['db_pool'] = stats
+
+    return JsonResponse(status)
+
+
+def readiness_check(_request):
+    report = health.readiness()
+    return JsonResponse(report, status=503 if report['status'] == health.UNAVAILABLE else 200)
+
+
+def metrics_view(_request):
+    body, content_type = metrics.render()
+    return HttpResponse(body, content_type=content_type)
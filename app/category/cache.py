@@ -0,0 +1,100 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from core.cache import TTLCache
+from core.models import Category
+
+VERSION_KEY = 'category:version'
+LIST_VERSION_KEY = 'category:list:version'
+
+categories = TTLCache(maxsize=settings.CATEGORY_CACHE_SIZE, ttl=settings.CATEGORY_CACHE_TTL)
+# Rendered category list bodies, keyed by list version and media type
+responses = TTLCache(maxsize=8, ttl=settings.CATEGORY_CACHE_TTL)
+
+
+def get_version(key=VERSION_KEY):
+    version = cache.get(key)
+    if version is None:
+        # Seeding from the clock keeps an evicted version from ever coming back
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+
+    return version
+
+
+def increment_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_version():
+    increment_version(VERSION_KEY)
+    categories.clear()
+    bump_list_version()
+
+
+def get_list_version():
+    return get_version(LIST_VERSION_KEY)
+
+
+def invalidate_list():
+    increment_version(LIST_VERSION_KEY)
+    responses.clear()
+
+
+def bump_list_version():
+    invalidate_list()
+    if connection.in_atomic_block:
+        # A list rendered before the commit holds the old rows under the new
+        # version, move past it once the change is visible
+        transaction.on_commit(invalidate_list)
+
+
+def get_category(name):
+    version = get_version()
+    category = categories.get((version, name))
+    if category is not None:
+        return category
+
+    category, created = Category.objects.get_or_create(name=name)
+    if created:
+        # Creating the row bumped the version through the post_save signal
+        version = get_version()
+
+    transaction.on_commit(lambda: categories.set((version, name), category))
+    return category
+
+
+def get_categories(names):
+    version = get_version()
+    resolved = {}
+    for name in names:
+        category = categories.get((version, name))
+        if category is not None:
+            resolved[name] = category
+
+    missing = set(names) - set(resolved)
+    if not missing:
+        return resolved
+
+    # Iterating by descending id lets the oldest row win on duplicated names
+    for category in Category.objects.filter(name__in=missing).order_by('-id'):
+        resolved[category.name] = category
+
+    new_categories = [Category(name=name) for name in missing - set(resolved)]
+    if new_categories:
+        # bulk_create skips the model signals, so invalidate explicitly
+        Category.objects.bulk_create(new_categories)
+        bump_version()
+        version = get_version()
+        resolved.update((category.name, category) for category in new_categories)
+
+    def store():
+        for name in missing:
+            categories.set((version, name), resolved[name])
+
+    transaction.on_commit(store)
+    return resolved
@@ -1,8 +1,12 @@
+import json
+from django.core.cache import cache
 from django.urls import reverse
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
 from core.models import Category
+from core.testing import QueryBudgetMixin
+from category import cache as category_cache
 from category.serializers import CategorySerializer
 
 CATEGORY_URL = reverse('category:category-list')
@@ -24,7 +28,7 @@ class PublicCategoriesAPITests(TestCase):
         serializer = CategorySerializer(categories, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(json.loads(response.content), serializer.data)
 
     def test_create_categories(self):
         payload = {
@@ -55,4 +59,84 @@ class PublicCategoriesAPITests(TestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(Category.objects.filter(id=category.id).exists())
\ No newline at end of file
+        self.assertFalse(Category.objects.filter(id=category.id).exists())
+
+
+class CategoryQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def create_categories(self, count):
+        for index in range(count):
+            Category.objects.create(name=f'Category {index}')
+
+    def test_list_runs_constant_queries(self):
+        self.assertConstantQueries(lambda: self.client.get(CATEGORY_URL), self.create_categories, sizes=(1, 10))
+
+    def test_update_within_budget(self):
+        category = Category.objects.create(name='Food')
+
+        with self.assertMaxQueries(2):
+            response = self.client.patch(detail_url(category.id), {'name': 'Drinks'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class CategoryListCacheTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        category_cache.responses.clear()
+        Category.objects.create(name='Delivery')
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(CATEGORY_URL)
+
+        with self.assertMaxQueries(0):
+            second = self.client.get(CATEGORY_URL)
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertIn('max-age', second['Cache-Control'])
+
+    def test_list_returns_not_modified_for_matching_etag(self):
+        etag = self.client.get(CATEGORY_URL)['ETag']
+
+        response = self.client.get(CATEGORY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_create_invalidates_list(self):
+        etag = self.client.get(CATEGORY_URL)['ETag']
+        self.client.post(CATEGORY_URL, {'name': 'Pickup'})
+
+        response = self.client.get(CATEGORY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([category['name'] for category in json.loads(response.content)], ['Delivery', 'Pickup'])
+
+    def test_update_invalidates_list(self):
+        category = Category.objects.get(name='Delivery')
+        self.client.get(CATEGORY_URL)
+        self.client.patch(detail_url(category.id), {'name': 'Freight'})
+
+        response = self.client.get(CATEGORY_URL)
+
+        self.assertEqual(json.loads(response.content)[0]['name'], 'Freight')
+
+    def test_delete_invalidates_list(self):
+        category = Category.objects.get(name='Delivery')
+        self.client.get(CATEGORY_URL)
+        self.client.delete(detail_url(category.id))
+
+        response = self.client.get(CATEGORY_URL)
+
+        self.assertEqual(json.loads(response.content), [])
+
+    def test_commit_moves_list_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            version = category_cache.get_list_version()
+            Category.objects.create(name='Pickup')
+            bumped = category_cache.get_list_version()
+
+        self.assertNotEqual(bumped, version)
+        self.assertNotEqual(category_cache.get_list_version(), bumped)
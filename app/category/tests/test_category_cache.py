@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.test import TestCase
+from core.models import Category
+from category import cache as category_cache
+
+
+class CategoryCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category_cache.categories.clear()
+
+    def resolve(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            return category_cache.get_category(name)
+
+    def test_resolve_creates_missing_category(self):
+        category = self.resolve('Cargo')
+
+        self.assertTrue(Category.objects.filter(id=category.id, name='Cargo').exists())
+
+    def test_resolve_is_served_from_cache(self):
+        first = self.resolve('Cargo')
+
+        with self.assertNumQueries(0):
+            second = category_cache.get_category('Cargo')
+
+        self.assertEqual(first.id, second.id)
+
+    def test_uncommitted_category_is_not_cached(self):
+        category_cache.get_category('Cargo')
+
+        self.assertEqual(len(category_cache.categories), 0)
+
+    def test_save_invalidates_cache(self):
+        category = self.resolve('Cargo')
+        version = category_cache.get_version()
+
+        category.name = 'Freight'
+        category.save()
+
+        self.assertNotEqual(category_cache.get_version(), version)
+        self.assertEqual(len(category_cache.categories), 0)
+        self.assertNotEqual(self.resolve('Cargo').id, category.id)
+        self.assertEqual(self.resolve('Freight').id, category.id)
+
+    def test_delete_invalidates_cache(self):
+        category = self.resolve('Cargo')
+        category.delete()
+
+        recreated = self.resolve('Cargo')
+
+        self.assertNotEqual(recreated.id, category.id)
+        self.assertTrue(Category.objects.filter(id=recreated.id).exists())
+
+    def test_cache_is_bounded(self):
+        self.addCleanup(setattr, category_cache.categories, 'maxsize', category_cache.categories.maxsize)
+        category_cache.categories.maxsize = 2
+
+        names = ['Cargo', 'Food', 'Truck']
+        for name in names:
+            Category.objects.create(name=name)
+
+        for name in names:
+            self.resolve(name)
+
+        self.assertEqual(len(category_cache.categories), 2)
+
+    def test_resolve_many_in_single_query(self):
+        Category.objects.create(name='Cargo')
+
+        with self.assertNumQueries(1):
+            resolved = category_cache.get_categories({'Cargo'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resolved = category_cache.get_categories({'Cargo', 'Food', 'Truck'})
+
+        self.assertEqual(set(resolved), {'Cargo', 'Food', 'Truck'})
+        self.assertEqual(Category.objects.count(), 3)
+        with self.assertNumQueries(0):
+            category_cache.get_categories({'Cargo', 'Food', 'Truck'})
@@ -1,9 +1,13 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
 from rest_framework import (
     viewsets,
     mixins
 )
 from core.models import Category
-from category import serializers
+from category import cache, serializers
 
 
 class CategoryViewSet(mixins.UpdateModelMixin,
@@ -15,4 +19,41 @@ class CategoryViewSet(mixins.UpdateModelMixin,
     queryset = Category.objects.all()
 
     def get_queryset(self):
-        return self.queryset.all().order_by('name')
\ No newline at end of file
+        return self.queryset.all().order_by('name')
+
+    def list(self, request, *args, **kwargs):
+        # The browsable API renders forms around the data, only cache plain bodies
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        version = cache.get_list_version()
+        etag = quote_etag(f'categories-{version}')
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(self.get_rendered_list(version), content_type=self.get_content_type())
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=settings.CATEGORY_LIST_MAX_AGE)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def get_rendered_list(self, version):
+        key = (version, self.request.accepted_media_type)
+        content = cache.responses.get(key)
+        if content is None:
+            serializer = self.get_serializer(self.get_queryset(), many=True)
+            content = self.request.accepted_renderer.render(
+                serializer.data,
+                self.request.accepted_media_type,
+                self.get_renderer_context(),
+            )
+            cache.responses.set(key, content)
+
+        return content
+
+    def get_content_type(self):
+        renderer = self.request.accepted_renderer
+        if renderer.charset:
+            return f'{self.request.accepted_media_type}; charset={renderer.charset}'
+
+        return self.request.accepted_media_type
@@ -1,11 +1,36 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from core import models
 
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator answering the count of an unfiltered listing from the planner
+    statistics, which are close enough to number the pages of a large table.
+    """
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where:
+            with connections[self.object_list.db].cursor() as cursor:
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [query.model._meta.db_table])
+                row = cursor.fetchone()
+
+            if row and row[0] >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+
+        return super().count
+
 class UserAdmin(BaseUserAdmin):
     ordering = ['id']
-    list_display = ['email', 'name']
+    list_display = ['email', 'name', 'order_count']
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         (
@@ -36,6 +61,26 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        totals = models.OrderStat.objects.filter(user=OuterRef('pk'), dimension=models.OrderStat.TOTAL, key='')
+        return super().get_queryset(request).annotate(order_count=Coalesce(Subquery(totals.values('count')), 0))
+
+    @admin.display(description=_('Orders'), ordering='order_count')
+    def order_count(self, user):
+        return user.order_count
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Order)
+
+
+class OrderAdmin(admin.ModelAdmin):
+    ordering = ['-id']
+    list_display = ['id', 'user', 'company', 'category', 'deadline']
+    list_select_related = ['user', 'category']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('search_vector')
+
+admin.site.register(models.Order, OrderAdmin)
 admin.site.register(models.Category)
\ No newline at end of file
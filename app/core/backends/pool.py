@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from collections import deque
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections holding up to ``max_size`` idle
+    connections and opening up to ``max_overflow`` extra ones under load,
+    which are closed instead of kept when they are released.
+    """
+    def __init__(self, connect, max_size, max_overflow, timeout, recycle, pre_ping):
+        self.connect = connect
+        self.max_size = max_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.pid = os.getpid()
+        self.size = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.discarded = 0
+        self._idle = deque()
+        self._created = {}
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection, returned_at = self._reserve(deadline)
+            if connection is None:
+                return self._open()
+
+            if self._is_healthy(connection, returned_at):
+                return connection
+
+            self._discard(connection)
+
+    def release(self, connection, discard=False):
+        expired = time.monotonic() - self._created.get(id(connection), 0) > self.recycle
+        if discard or expired or connection.closed:
+            self._discard(connection)
+            return
+
+        try:
+            if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except OperationalError:
+            self._discard(connection)
+            return
+
+        with self._condition:
+            if len(self._idle) >= self.max_size:
+                keep = False
+            else:
+                keep = True
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+
+        if not keep:
+            self._discard(connection)
+
+    def stats(self):
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                'size': self.size,
+                'idle': idle,
+                'in_use': self.size - idle,
+                'overflow': max(self.size - self.max_size, 0),
+                'max_size': self.max_size,
+                'max_overflow': self.max_overflow,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'discarded': self.discarded,
+            }
+
+    def close(self):
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _reserve(self, deadline):
+        with self._condition:
+            while True:
+                if self._idle:
+                    self.checkouts += 1
+                    # LIFO keeps a warm core of connections and lets the rest age out
+                    return self._idle.pop()
+
+                if self.size < self.max_size + self.max_overflow:
+                    self.size += 1
+                    self.checkouts += 1
+                    return None, None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f'Connection pool exhausted: {self.size} connections in use, '
+                        f'waited {self.timeout}s'
+                    )
+
+                self.waits += 1
+                self._condition.wait(remaining)
+
+    def _open(self):
+        try:
+            connection = self.connect()
+        except Exception:
+            with self._condition:
+                self.size -= 1
+                self._condition.notify()
+            raise
+
+        self._created[id(connection)] = time.monotonic()
+        return connection
+
+    def _is_healthy(self, connection, returned_at):
+        if connection.closed:
+            return False
+
+        if time.monotonic() - returned_at < self.pre_ping:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except OperationalError:
+            return False
+
+        return True
+
+    def _discard(self, connection):
+        self._created.pop(id(connection), None)
+        try:
+            connection.close()
+        except OperationalError:
+            pass
+
+        with self._condition:
+            self.size -= 1
+            self.discarded += 1
+            self._condition.notify()
@@ -0,0 +1,104 @@
+import os
+import threading
+import psycopg2.extras
+from django.db.backends.postgresql.base import Database, DatabaseWrapper as PostgresDatabaseWrapper
+from core.backends.pool import ConnectionPool
+
+pools = {}
+pools_lock = threading.Lock()
+
+POOL_DEFAULTS = {
+    'ENABLED': False,
+    'MAX_SIZE': 10,
+    'MAX_OVERFLOW': 10,
+    'TIMEOUT': 30,
+    'RECYCLE': 3600,
+    'PRE_PING': 10,
+}
+
+
+def connect(conn_params):
+    connection = Database.connect(**conn_params)
+    psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+    return connection
+
+
+def pool_stats():
+    return {alias: pool.stats() for (alias, _), pool in list(pools.items()) if pool.pid == os.getpid()}
+
+
+def close_pools():
+    with pools_lock:
+        closing = list(pools.values())
+        pools.clear()
+
+    for pool in closing:
+        pool.close()
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """
+    PostgreSQL backend adding health checks to persistent connections and an
+    optional in-process connection pool, configured through the ``POOL`` key
+    of the database settings.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_settings = {**POOL_DEFAULTS, **self.settings_dict.get('POOL', {})}
+        self.health_check_done = False
+
+    def get_pool(self, conn_params):
+        key = (self.alias, tuple(sorted(conn_params.items())))
+        with pools_lock:
+            pool = pools.get(key)
+            # A pool inherited through fork shares sockets with the parent
+            if pool is None or pool.pid != os.getpid():
+                pool = pools[key] = ConnectionPool(
+                    connect=lambda: connect(conn_params),
+                    max_size=self.pool_settings['MAX_SIZE'],
+                    max_overflow=self.pool_settings['MAX_OVERFLOW'],
+                    timeout=self.pool_settings['TIMEOUT'],
+                    recycle=self.pool_settings['RECYCLE'],
+                    pre_ping=self.pool_settings['PRE_PING'],
+                )
+
+        return pool
+
+    def get_new_connection(self, conn_params):
+        if not self.pool_settings['ENABLED']:
+            return super().get_new_connection(conn_params)
+
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.acquire()
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get('isolation_level', connection.isolation_level)
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+
+        return connection
+
+    def _close(self):
+        if self.connection is None or not self.pool_settings['ENABLED']:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            self.pool.release(self.connection, discard=self.errors_occurred)
+
+    def connect(self):
+        # Set first, connect() itself goes back through ensure_connection()
+        self.health_check_done = True
+        super().connect()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        # A persistent connection may have been dropped by the server since
+        # the last request, check it once before its first use
+        if self.connection is not None and not self.health_check_done and not self.in_atomic_block:
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+
+        super().ensure_connection()
@@ -0,0 +1,88 @@
+import threading
+import time
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+OK = 'ok'
+DEGRADED = 'degraded'
+UNAVAILABLE = 'unavailable'
+
+lock = threading.Lock()
+cached = {'expires': 0.0, 'result': None}
+# Migration files cannot change under a running process, once the plan is
+# empty it stays empty
+migrations_applied = False
+
+
+def check_database():
+    start = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError as error:
+        return {'ok': False, 'error': str(error).strip()}
+
+    latency = (time.perf_counter() - start) * 1000
+    return {
+        'ok': True,
+        'latency_ms': round(latency, 2),
+        'slow': latency > settings.READINESS_DB_LATENCY_THRESHOLD,
+    }
+
+
+def check_migrations():
+    global migrations_applied
+
+    if not migrations_applied:
+        executor = MigrationExecutor(connection)
+        pending = len(executor.migration_plan(executor.loader.graph.leaf_nodes()))
+        if pending:
+            return {'ok': False, 'pending': pending}
+        migrations_applied = True
+
+    return {'ok': True, 'pending': 0}
+
+
+def run_checks():
+    database = check_database()
+    checks = {'database': database}
+    if database['ok']:
+        try:
+            checks['migrations'] = check_migrations()
+        except DatabaseError as error:
+            checks['migrations'] = {'ok': False, 'error': str(error).strip()}
+
+    if not all(check['ok'] for check in checks.values()):
+        status = UNAVAILABLE
+    elif database['slow']:
+        status = DEGRADED
+    else:
+        status = OK
+
+    return {'status': status, 'checks': checks, 'checked_at': timezone.now().isoformat()}
+
+
+def readiness():
+    """
+    Return the readiness report, checking the database at most once every
+    READINESS_CACHE_TTL seconds per process. Concurrent probes wait for the
+    running check instead of starting their own.
+    """
+    with lock:
+        now = time.monotonic()
+        if cached['result'] is None or now >= cached['expires']:
+            cached['result'] = run_checks()
+            cached['expires'] = now + settings.READINESS_CACHE_TTL
+
+        return cached['result']
+
+
+def reset():
+    global migrations_applied
+
+    with lock:
+        cached['result'] = None
+        migrations_applied = False
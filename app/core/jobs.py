@@ -0,0 +1,147 @@
+import json
+import logging
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+from core import metrics
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+tasks = {}
+
+
+def task(name):
+    """Register a function as the handler of jobs called ``name``."""
+    def decorator(function):
+        tasks[name] = function
+        return function
+
+    return decorator
+
+
+def discover():
+    # Handlers live in each app's tasks module
+    autodiscover_modules('tasks')
+
+
+def enqueue(name, payload=None, queue='default', delay=0, max_attempts=None):
+    """
+    Queue a job. It is written in the caller's transaction, so it only
+    becomes visible to workers if that transaction commits.
+    """
+    return Job.objects.create(**job_fields(name, payload, queue, delay, max_attempts))
+
+
+def enqueue_many(name, payloads, queue='default', delay=0, max_attempts=None):
+    return Job.objects.bulk_create([Job(**job_fields(name, payload, queue, delay, max_attempts)) for payload in payloads])
+
+
+def job_fields(name, payload, queue, delay, max_attempts):
+    return {
+        'name': name,
+        'payload': payload or {},
+        'queue': queue,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+        'max_attempts': max_attempts or settings.JOB_MAX_ATTEMPTS,
+    }
+
+
+def retry_delay(attempts):
+    return min(settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOB_RETRY_BACKOFF_MAX)
+
+
+def claim(worker, queues, batch_size):
+    """
+    Lock up to ``batch_size`` due jobs for ``worker``. SKIP LOCKED lets
+    concurrent workers claim disjoint batches without waiting on each other.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'''
+            UPDATE {Job._meta.db_table} SET status = %s, locked_at = now(), locked_by = %s, attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM {Job._meta.db_table}
+                WHERE status = %s AND queue = ANY(%s) AND run_at <= now()
+                ORDER BY run_at, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, name, payload, attempts, max_attempts
+        ''', [Job.RUNNING, worker, Job.QUEUED, list(queues), batch_size])
+        # Django leaves jsonb undecoded on raw cursors
+        return sorted(
+            (job_id, name, json.loads(payload), attempts, max_attempts)
+            for job_id, name, payload, attempts, max_attempts in cursor.fetchall()
+        )
+
+
+def requeue_stale():
+    """
+    Return jobs of workers that died mid-run to the queue, as a
+    ``(requeued, failed)`` count. Jobs that used their last attempt fail
+    instead, one that keeps killing its worker would otherwise run forever.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, last_error='Worker stopped during the last attempt', locked_at=None, finished_at=now,
+    )
+    requeued = stale.update(status=Job.QUEUED, locked_at=None, locked_by='', run_at=now)
+    if failed:
+        logger.error('%d jobs failed, their workers stopped during the last attempt', failed)
+
+    return requeued, failed
+
+
+def run(job_id, name, payload, attempts, max_attempts):
+    """Run one claimed job, returning True when it succeeded."""
+    start = time.perf_counter()
+    try:
+        handler = tasks[name]
+        # Whatever the handler wrote is rolled back when it fails
+        with transaction.atomic():
+            handler(**payload)
+    except Exception as error:
+        metrics.JOBS.labels(name, 'failed').inc()
+        metrics.JOB_DURATION.labels(name).observe(time.perf_counter() - start)
+        fail(job_id, name, attempts, max_attempts, error)
+        return False
+
+    metrics.JOBS.labels(name, 'done').inc()
+    metrics.JOB_DURATION.labels(name).observe(time.perf_counter() - start)
+    return True
+
+
+def fail(job_id, name, attempts, max_attempts, error):
+    message = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+    if attempts >= max_attempts:
+        logger.error('Job %s #%s failed after %d attempts: %s', name, job_id, attempts, error)
+        Job.objects.filter(pk=job_id).update(
+            status=Job.FAILED, last_error=message, locked_at=None, finished_at=timezone.now(),
+        )
+        return
+
+    logger.warning('Job %s #%s failed, attempt %d of %d: %s', name, job_id, attempts, max_attempts, error)
+    Job.objects.filter(pk=job_id).update(
+        status=Job.QUEUED, last_error=message, locked_at=None, locked_by='',
+        run_at=timezone.now() + timedelta(seconds=retry_delay(attempts)),
+    )
+
+
+def complete(job_ids):
+    # One statement for the whole batch
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids).update(status=Job.DONE, locked_at=None, finished_at=timezone.now())
+
+
+def work_batch(worker, queues, batch_size):
+    """Claim and run one batch, returning ``(done, failed)`` counts."""
+    jobs = claim(worker, queues, batch_size)
+    succeeded = [job[0] for job in jobs if run(*job)]
+    complete(succeeded)
+    return len(succeeded), len(jobs) - len(succeeded)
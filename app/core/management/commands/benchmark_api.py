@@ -0,0 +1,221 @@
+import json
+import statistics
+import subprocess
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from core.models import Order, OrderStat
+from core.queries import count_queries
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(values, rank):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(rank / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, elapsed):
+    latencies = [sample['latency'] * 1000 for sample in samples]
+    queries = [sample['queries'] for sample in samples]
+    return {
+        'requests': len(samples),
+        'throughput': round(len(samples) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            **{f'p{rank}': round(percentile(latencies, rank), 3) for rank in PERCENTILES},
+            'mean': round(statistics.mean(latencies), 3),
+            'max': round(max(latencies), 3),
+        },
+        'queries': {'mean': round(statistics.mean(queries), 2), 'max': max(queries)},
+        'query_ms': round(statistics.mean(sample['query_time'] for sample in samples) * 1000, 3),
+        'status': dict(sorted(Counter(str(sample['status']) for sample in samples).items())),
+    }
+
+
+@contextmanager
+def run_on_commit_hooks():
+    """
+    Run the on_commit hooks registered inside the block when it ends, as a
+    commit would. The benchmark's writes share one transaction that is
+    rolled back, so their hooks would otherwise never run.
+    """
+    start = len(connection.run_on_commit)
+    yield
+    hooks = connection.run_on_commit[start:]
+    del connection.run_on_commit[start:]
+    for _, hook in hooks:
+        hook()
+
+
+def current_commit():
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.stdout.strip()
+
+
+class Command(BaseCommand):
+    help = 'Drive every API route in-process and report latency percentiles, throughput and query counts as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', help='User to benchmark as, defaults to the one with the most orders')
+        parser.add_argument('--password', default='benchmark123')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per route')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per route')
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--host', default='localhost', help='Host header, must be in ALLOWED_HOSTS')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--compare', help='Previous JSON report to print latency and query deltas against')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be positive')
+
+        user = self.get_user(options['email'])
+        client = Client(HTTP_HOST=options['host'])
+
+        # Writes made by the create and update routes are rolled back, each
+        # request still runs its on_commit hooks
+        with transaction.atomic():
+            token = self.request(client, 'post', reverse('user:token'), {
+                'email': user.email, 'password': options['password'],
+            })
+            if token['status'] != 200:
+                raise CommandError(f'Could not log in as {user.email}, check --password')
+            client.defaults['HTTP_AUTHORIZATION'] = f'Token {token["response"].json()["token"]}'
+
+            order = Order.objects.filter(user=user).order_by('-id').first()
+            if order is None:
+                raise CommandError(f'{user.email} has no orders, run seed_orders first')
+
+            routes = {}
+            for name, make_request in self.get_scenarios(user, order, options).items():
+                for _ in range(options['warmup']):
+                    make_request(client)
+
+                samples = []
+                start = time.perf_counter()
+                for _ in range(options['requests']):
+                    samples.append(make_request(client))
+                routes[name] = summarize(samples, time.perf_counter() - start)
+
+            transaction.set_rollback(True)
+
+        report = {
+            'meta': {
+                'commit': current_commit(),
+                'created': timezone.now().isoformat(),
+                'user_orders': Order.objects.filter(user=user).count(),
+                'total_orders': Order.objects.count(),
+                'requests': options['requests'],
+                'warmup': options['warmup'],
+                'page_size': options['page_size'],
+            },
+            'routes': routes,
+        }
+        content = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(content + '\n')
+        else:
+            self.stdout.write(content)
+
+        if options['compare']:
+            self.compare(options['compare'], report)
+
+    def get_user(self, email):
+        users = get_user_model().objects
+        if email:
+            user = users.filter(email=email).first()
+        else:
+            heaviest = OrderStat.objects.filter(dimension=OrderStat.TOTAL).order_by('-count').first()
+            user = heaviest and users.filter(pk=heaviest.user_id).first()
+
+        if user is None:
+            raise CommandError('No user to benchmark as, run seed_orders or pass --email')
+
+        return user
+
+    def request(self, client, method, path, data=None, **extra):
+        with count_queries() as counter:
+            start = time.perf_counter()
+            with run_on_commit_hooks():
+                if method == 'get':
+                    response = client.get(path, data, **extra)
+                else:
+                    response = getattr(client, method)(
+                        path, json.dumps(data), content_type='application/json', **extra,
+                    )
+            latency = time.perf_counter() - start
+
+        return {
+            'latency': latency,
+            'status': response.status_code,
+            'queries': counter.count,
+            'query_time': counter.duration,
+            'response': response,
+        }
+
+    def get_scenarios(self, user, order, options):
+        detail_url = reverse('order:order-detail', args=[order.pk])
+        body = {
+            'contact_name': 'Benchmark Contact',
+            'contact_phone': '+5583991382914',
+            'real_state_agency': 'Benchmark Agency',
+            'company': 'Benchmark Company',
+            'deadline': (date.today() + timedelta(days=30)).isoformat(),
+            'category': {'name': order.category.name},
+            'description': 'Benchmark order',
+        }
+        credentials = {'email': user.email, 'password': options['password']}
+        page = {'page_size': options['page_size']}
+        return {
+            'token': lambda client: self.request(client, 'post', reverse('user:token'), credentials),
+            'user_me': lambda client: self.request(client, 'get', reverse('user:me')),
+            'order_list': lambda client: self.request(client, 'get', reverse('order:order-list'), page),
+            'order_detail': lambda client: self.request(client, 'get', detail_url),
+            'order_create': lambda client: self.request(client, 'post', reverse('order:order-list'), body),
+            'order_update': lambda client: self.request(client, 'patch', detail_url, {'company': 'Benchmark Updated'}),
+            'category_list': lambda client: self.request(client, 'get', reverse('category:category-list')),
+        }
+
+    def compare(self, path, report):
+        try:
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)['routes']
+        except (OSError, ValueError, KeyError) as error:
+            raise CommandError(f'Could not read baseline report {path}: {error}')
+
+        self.stderr.write(f'{"route":<16} {"p50 ms":>18} {"p99 ms":>18} {"queries":>14}')
+        for name, route in report['routes'].items():
+            before = baseline.get(name)
+            if before is None:
+                self.stderr.write(f'{name:<16} (not in baseline)')
+                continue
+
+            columns = [
+                self.delta(before['latency_ms']['p50'], route['latency_ms']['p50']),
+                self.delta(before['latency_ms']['p99'], route['latency_ms']['p99']),
+                self.delta(before['queries']['mean'], route['queries']['mean'], percent=False),
+            ]
+            self.stderr.write(f'{name:<16} {columns[0]:>18} {columns[1]:>18} {columns[2]:>14}')
+
+    def delta(self, before, after, percent=True):
+        if not percent or not before:
+            return f'{before:g} -> {after:g}'
+
+        return f'{after:.2f} ({(after - before) / before:+.0%})'
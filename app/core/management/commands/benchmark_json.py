@@ -0,0 +1,69 @@
+import io
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core.models import Category, Order
+from core.renderers import ORJSONParser, ORJSONRenderer
+from order.serializers import OrderSerializer
+
+BACKENDS = {
+    'standard': (JSONRenderer, JSONParser),
+    'orjson': (ORJSONRenderer, ORJSONParser),
+}
+
+
+def build_payload(size):
+    categories = [Category(id=index, name=f'Category {index}') for index in range(1, 21)]
+    orders = [
+        Order(
+            id=index,
+            contact_name=f'Contact Ñame {index}',
+            contact_phone='+5583991382914',
+            description='Deliver the boxes to the back entrance, ring twice',
+            real_state_agency=f'Agency {index % 50}',
+            company=f'Company {index % 200}',
+            deadline=date(2030, 1, 1) + timedelta(days=index % 365),
+            category=categories[index % len(categories)],
+        )
+        for index in range(1, size + 1)
+    ]
+    return OrderSerializer(orders, many=True).data
+
+
+def measure(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+class Command(BaseCommand):
+    help = 'Compare the standard and orjson renderer/parser pairs on OrderSerializer payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000], help='Orders per payload')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement, the best one is reported')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"orders":>8} {"backend":>10} {"render ms":>10} {"parse ms":>10} {"bytes":>10}')
+        for size in options['sizes']:
+            data = build_payload(size)
+            results = {}
+            for name, (renderer_class, parser_class) in BACKENDS.items():
+                renderer, parser = renderer_class(), parser_class()
+                content = renderer.render(data, 'application/json')
+                render_time = measure(lambda: renderer.render(data, 'application/json'), options['repeat'])
+                parse_time = measure(lambda: parser.parse(io.BytesIO(content)), options['repeat'])
+                results[name] = render_time
+                self.stdout.write(
+                    f'{size:>8} {name:>10} {render_time * 1000:>10.2f} {parse_time * 1000:>10.2f} {len(content):>10}'
+                )
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{size} orders: orjson renders {results["standard"] / results["orjson"]:.1f}x faster'
+            ))
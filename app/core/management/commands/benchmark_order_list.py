@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from core.management.commands.benchmark_json import measure
+from core.models import Category, Order
+from order.projection import project_orders, represent_orders
+from order.serializers import OrderSerializer
+
+
+def seed_orders(size):
+    user = get_user_model().objects.create_user(email='benchmark-order-list@example.com', password=None)
+    categories = Category.objects.bulk_create(Category(name=f'Benchmark {index}') for index in range(20))
+    Order.objects.bulk_create(
+        (
+            Order(
+                user=user,
+                contact_name=f'Contact {index}',
+                contact_phone='+5583991382914',
+                description='Deliver the boxes to the back entrance, ring twice',
+                real_state_agency=f'Agency {index % 50}',
+                company=f'Company {index % 200}',
+                deadline=date(2030, 1, 1) + timedelta(days=index % 365),
+                category=categories[index % len(categories)],
+            )
+            for index in range(size)
+        ),
+        batch_size=1000,
+    )
+    return Order.objects.filter(user=user).order_by('-id')
+
+
+class Command(BaseCommand):
+    help = 'Compare OrderSerializer and the projection fast path on order list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000], help='Orders per page')
+        parser.add_argument('--repeat', type=int, default=10, help='Runs per measurement, the best one is reported')
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        paths = {
+            'serializer': lambda queryset: OrderSerializer(queryset.select_related('category'), many=True).data,
+            'projection': lambda queryset: represent_orders(project_orders(queryset)),
+        }
+
+        # Seeded rows are rolled back once the measurements are done
+        with transaction.atomic():
+            orders = seed_orders(max(options['sizes']))
+            self.stdout.write(f'{"orders":>8} {"path":>12} {"ms":>10} {"rows/s":>12}')
+            for size in options['sizes']:
+                page = orders[:size]
+                outputs = {name: renderer.render(path(page)) for name, path in paths.items()}
+                if outputs['serializer'] != outputs['projection']:
+                    self.stderr.write(self.style.ERROR(f'{size} orders: projection output differs from OrderSerializer'))
+
+                for name, path in paths.items():
+                    elapsed = measure(lambda: renderer.render(path(page)), options['repeat'])
+                    self.stdout.write(f'{size:>8} {name:>12} {elapsed * 1000:>10.2f} {size / elapsed:>12.0f}')
+
+            transaction.set_rollback(True)
@@ -0,0 +1,24 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.schema import RENDERERS, generate, schema_path
+
+
+class Command(BaseCommand):
+    help = 'Write the OpenAPI schema as YAML and JSON for CachedSchemaView to serve without introspection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Directory to write to, defaults to OPENAPI_SCHEMA_DIR')
+
+    def handle(self, *args, **options):
+        directory = options['output'] or settings.OPENAPI_SCHEMA_DIR
+        if not directory:
+            raise CommandError('Pass --output or set OPENAPI_SCHEMA_DIR')
+
+        os.makedirs(directory, exist_ok=True)
+        schema = generate()
+        for renderer_class in RENDERERS:
+            path = schema_path(directory, renderer_class.format)
+            with open(path, 'wb') as schema_file:
+                schema_file.write(renderer_class().render(schema, renderer_class.media_type, {}))
+            self.stdout.write(f'Wrote {path}')
@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+import os
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from category.cache import bump_version
+from core.models import Category, Order
+from core.util import phone_regex
+
+STAGING_TABLE = 'order_import'
+
+COLUMNS = [
+    'id',
+    'contact_name',
+    'contact_phone',
+    'description',
+    'real_state_agency',
+    'company',
+    'deadline',
+    'category',
+    'category_id',
+]
+
+REQUIRED_COLUMNS = ['contact_name', 'contact_phone', 'description', 'real_state_agency', 'company', 'deadline', 'category']
+
+COLUMN_ALIASES = {'category_name': 'category'}
+
+REJECT_COLUMNS = ['line', 'reason'] + REQUIRED_COLUMNS
+
+DATE_PATTERN = r'^[1-9]\d{3}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])$'
+
+
+class IteratorFile(io.TextIOBase):
+    def __init__(self, lines):
+        self.lines = lines
+        self.buffer = ''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            try:
+                self.buffer += next(self.lines)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self.buffer)
+
+        chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+        return chunk
+
+
+class Command(BaseCommand):
+    help = 'Bulk import orders for a user from a CSV or NDJSON file using COPY'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help='Email of the user owning the imported orders')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension')
+        parser.add_argument('--rejects', help='Where rejected rows are written, defaults to <path>.rejects.csv')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format not in ('csv', 'ndjson'):
+            raise CommandError('Unable to detect the file format, use --format')
+
+        try:
+            user = get_user_model().objects.get(email=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'User {options["user"]} does not exist')
+
+        rejects_path = options['rejects'] or f'{path}.rejects.csv'
+        start = time.perf_counter()
+
+        with open(path, newline='', encoding='utf-8') as source, transaction.atomic():
+            with connection.cursor() as cursor:
+                self.create_staging_table(cursor)
+                if file_format == 'csv':
+                    self.copy_csv(cursor, source)
+                else:
+                    self.copy_ndjson(cursor, source)
+
+                self.validate(cursor)
+                rejected = self.write_rejects(cursor, rejects_path)
+                created_categories = self.create_categories(cursor)
+                imported = self.merge(cursor, user)
+
+        if created_categories:
+            bump_version()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} orders in {elapsed:.2f}s '
+            f'({(imported + rejected) / max(elapsed, 1e-9):.0f} rows/s), '
+            f'created {created_categories} categories'
+        ))
+        if rejected:
+            self.stdout.write(self.style.WARNING(f'Rejected {rejected} rows, see {rejects_path}'))
+
+    def create_staging_table(self, cursor):
+        columns = ', '.join(f'{column} text' for column in COLUMNS)
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE {STAGING_TABLE} '
+            f'(line bigint, {columns}, deadline_date date, reason text) ON COMMIT DROP'
+        )
+
+    def copy_csv(self, cursor, source):
+        reader = csv.reader(source)
+        header = next(reader, [])
+        columns = [COLUMN_ALIASES.get(column.strip(), column.strip()) for column in header]
+        self.check_columns(columns)
+
+        def rows():
+            # A quoted value may span lines, number each record by its first
+            line = reader.line_num + 1
+            for record in reader:
+                yield [line] + record
+                line = reader.line_num + 1
+
+        self.copy_rows(cursor, ['line'] + columns, rows())
+
+    def copy_ndjson(self, cursor, source):
+        def rows():
+            for number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+
+                # Raising here would surface as an opaque COPY failure
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    invalid_lines.append((number, 'is not valid JSON'))
+                    return
+
+                if not isinstance(item, dict):
+                    invalid_lines.append((number, 'is not a JSON object'))
+                    return
+
+                category = item.get('category')
+                if isinstance(category, dict):
+                    category = category.get('name')
+
+                yield [number] + [item.get(column) for column in REQUIRED_COLUMNS[:-1]] + [category]
+
+        invalid_lines = []
+        self.copy_rows(cursor, ['line'] + REQUIRED_COLUMNS, rows())
+        if invalid_lines:
+            number, problem = invalid_lines[0]
+            raise CommandError(f'Line {number} {problem}')
+
+    def copy_rows(self, cursor, columns, rows):
+        def lines():
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(row)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        buffer = io.StringIO()
+        cursor.copy_expert(
+            f'COPY {STAGING_TABLE} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)',
+            IteratorFile(lines()),
+        )
+
+    def check_columns(self, columns):
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise CommandError(f'Unknown columns: {", ".join(sorted(unknown))}')
+
+        missing = set(REQUIRED_COLUMNS) - set(columns)
+        if missing:
+            raise CommandError(f'Missing columns: {", ".join(sorted(missing))}')
+
+    def validate(self, cursor):
+        required = ' OR '.join(f"coalesce({column}, '') = ''" for column in REQUIRED_COLUMNS)
+        too_long = ' OR '.join(
+            f'length({column}) > {Order._meta.get_field(column).max_length}'
+            for column in ['contact_name', 'real_state_agency', 'company']
+        )
+        # Nested CASEs keep make_date from running on values the pattern rejected
+        cursor.execute(
+            f'''
+            UPDATE {STAGING_TABLE} SET (deadline_date, reason) = (
+                SELECT parsed.deadline_date, CASE
+                    WHEN {required} THEN 'missing required field'
+                    WHEN {too_long} OR length(category) > %(category_length)s THEN 'value too long'
+                    WHEN contact_phone !~ %(phone_pattern)s THEN 'invalid phone'
+                    WHEN parsed.deadline_date IS NULL THEN 'invalid deadline'
+                    WHEN parsed.deadline_date < current_date THEN 'deadline in the past'
+                END
+                FROM (SELECT CASE WHEN deadline ~ %(date_pattern)s THEN
+                    CASE WHEN substr(deadline, 9, 2)::int <= extract(day from (
+                        date_trunc('month', make_date(substr(deadline, 1, 4)::int, substr(deadline, 6, 2)::int, 1))
+                        + interval '1 month - 1 day'
+                    ))
+                    THEN make_date(substr(deadline, 1, 4)::int, substr(deadline, 6, 2)::int, substr(deadline, 9, 2)::int)
+                    END
+                END AS deadline_date) parsed
+            )
+            ''',
+            {
+                'category_length': Category._meta.get_field('name').max_length,
+                'date_pattern': DATE_PATTERN,
+                'phone_pattern': phone_regex.regex.pattern,
+            },
+        )
+
+    def write_rejects(self, cursor, rejects_path):
+        cursor.execute(f'SELECT count(*) FROM {STAGING_TABLE} WHERE reason IS NOT NULL')
+        rejected = cursor.fetchone()[0]
+        if not rejected:
+            return 0
+
+        with open(rejects_path, 'w', newline='', encoding='utf-8') as rejects:
+            cursor.copy_expert(
+                f'COPY (SELECT {", ".join(REJECT_COLUMNS)} FROM {STAGING_TABLE} '
+                f'WHERE reason IS NOT NULL ORDER BY line) TO STDOUT WITH (FORMAT csv, HEADER true)',
+                rejects,
+            )
+
+        return rejected
+
+    def create_categories(self, cursor):
+        table = Category._meta.db_table
+        cursor.execute(
+            f'''
+            INSERT INTO {table} (name)
+            SELECT DISTINCT staging.category FROM {STAGING_TABLE} staging
+            WHERE staging.reason IS NULL
+              AND NOT EXISTS (SELECT 1 FROM {table} category WHERE category.name = staging.category)
+            '''
+        )
+        return cursor.rowcount
+
+    def merge(self, cursor, user):
+        cursor.execute(
+            f'''
+            INSERT INTO {Order._meta.db_table}
+                (user_id, contact_name, contact_phone, description, real_state_agency, company, deadline, category_id, updated_at)
+            SELECT %s, staging.contact_name, staging.contact_phone, staging.description,
+                   staging.real_state_agency, staging.company, staging.deadline_date, category.id, now()
+            FROM {STAGING_TABLE} staging
+            JOIN (
+                SELECT DISTINCT ON (name) id, name FROM {Category._meta.db_table} ORDER BY name, id
+            ) category ON category.name = staging.category
+            WHERE staging.reason IS NULL
+            ORDER BY staging.line
+            ''',
+            [user.id],
+        )
+        return cursor.rowcount
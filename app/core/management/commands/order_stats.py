@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from order.stats import find_inconsistencies, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the order statistics rollup, or check it against the live aggregate'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report rollup rows that differ from the live counts')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            inconsistencies = find_inconsistencies()
+            for user_id, dimension, key, stored, live in inconsistencies:
+                self.stdout.write(f'user {user_id} {dimension} {key!r}: stored {stored}, live {live}')
+
+            if inconsistencies:
+                raise CommandError(f'{len(inconsistencies)} order statistics differ from the live counts')
+
+            self.stdout.write(self.style.SUCCESS('Order statistics are consistent'))
+            return
+
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt order statistics: {rows} rows'))
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.profiling import MODES, TIMING, sign_mode
+
+
+class Command(BaseCommand):
+    help = 'Print a signed X-Profile header value that enables profiling for any request carrying it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=MODES, default=TIMING)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'X-Profile: {sign_mode(options["mode"])}')
+        self.stderr.write(f'Valid for {settings.PROFILING_SIGNATURE_MAX_AGE} seconds')
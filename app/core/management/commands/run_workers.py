@@ -0,0 +1,110 @@
+import os
+import signal
+import socket
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections, connections
+from core import jobs
+
+# Stale jobs are looked for at most this often
+REQUEUE_INTERVAL = 30
+# Seconds a worker waits after a database error, doubling up to the maximum
+RECONNECT_DELAY = 1
+RECONNECT_DELAY_MAX = 30
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers that claim batches with SELECT ... FOR UPDATE SKIP LOCKED'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent worker threads')
+        parser.add_argument('--queues', nargs='+', default=['default'])
+        parser.add_argument('--batch-size', type=int, default=10, help='Jobs claimed per round-trip')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when no job is due')
+        parser.add_argument('--report-interval', type=float, default=10.0, help='Seconds between throughput lines')
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due instead of polling')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--workers and --batch-size must be positive')
+
+        jobs.discover()
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.done = self.failed = 0
+        self.next_requeue = 0.0
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                handlers[signum] = signal.signal(signum, lambda *args: self.stop.set())
+        try:
+            self.run_workers(options)
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def run_workers(self, options):
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+        threads = [
+            threading.Thread(target=self.work, args=(f'{prefix}:{index}', options), name=f'job-worker-{index}')
+            for index in range(options['workers'])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        last_report, last_done = start, 0
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=options['report_interval'] / len(threads))
+            now = time.perf_counter()
+            if now - last_report >= options['report_interval']:
+                self.stdout.write(f'{self.done} done, {self.failed} failed, {(self.done - last_done) / (now - last_report):.1f} jobs/s')
+                last_report, last_done = now, self.done
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{self.done} jobs done, {self.failed} failed in {elapsed:.1f}s ({self.done / max(elapsed, 1e-9):.1f} jobs/s)'
+        ))
+
+    def work(self, worker, options):
+        errors = 0
+        try:
+            while not self.stop.is_set():
+                try:
+                    self.requeue_stale()
+                    done, failed = jobs.work_batch(worker, options['queues'], options['batch_size'])
+                except DatabaseError as error:
+                    # Claimed jobs of a lost batch go back through requeue_stale()
+                    errors += 1
+                    delay = min(RECONNECT_DELAY * 2 ** (errors - 1), RECONNECT_DELAY_MAX)
+                    self.stderr.write(f'{worker} hit a database error, retrying in {delay}s: {error}')
+                    close_old_connections()
+                    self.stop.wait(delay)
+                    continue
+
+                errors = 0
+                with self.lock:
+                    self.done += done
+                    self.failed += failed
+
+                if done + failed == 0:
+                    if options['burst']:
+                        return
+                    self.stop.wait(options['poll_interval'])
+        finally:
+            # Each thread owns its connections
+            connections.close_all()
+
+    def requeue_stale(self):
+        with self.lock:
+            if time.monotonic() < self.next_requeue:
+                return
+            self.next_requeue = time.monotonic() + REQUEUE_INTERVAL
+
+        requeued, failed = jobs.requeue_stale()
+        if requeued:
+            self.stderr.write(f'Requeued {requeued} jobs left running by dead workers')
+        if failed:
+            self.stderr.write(f'Failed {failed} jobs whose workers died during their last attempt')
@@ -0,0 +1,138 @@
+import time
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from category.cache import bump_version
+from core.models import Category, Order, User
+
+EMAIL_PATTERN = 'seed-%s@example.com'
+
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Fabio', 'Gabriela', 'Hugo', 'Iris', 'Joao', 'Karen', 'Lucas']
+LAST_NAMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Costa', 'Pereira', 'Almeida', 'Ribeiro', 'Gomes']
+COMPANY_WORDS = ['Arasaka', 'Militech', 'Kang Tao', 'Biotechnica', 'Petrochem', 'Zetatech', 'Orbital', 'Trauma']
+AGENCY_WORDS = ['Sigma', 'Prime', 'Horizon', 'Atlas', 'Nova', 'Vista', 'Central', 'Litoral']
+DESCRIPTION_WORDS = [
+    'deliver', 'boxes', 'fragile', 'glass', 'furniture', 'repair', 'roof', 'leak', 'paint', 'kitchen',
+    'urgent', 'inspection', 'electrical', 'plumbing', 'garden', 'cleaning', 'moving', 'storage', 'back', 'entrance',
+]
+CATEGORY_WORDS = ['Delivery', 'Repair', 'Cleaning', 'Moving', 'Inspection', 'Painting', 'Plumbing', 'Electrical']
+
+# power(random(), USER_SKEW) picks owners, a few heavy users hold most orders
+USER_SKEW = 3
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic dataset of users, categories and orders for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--categories', type=int, default=200)
+        parser.add_argument('--orders', type=int, default=1000000)
+        parser.add_argument('--batch-size', type=int, default=100000, help='Orders inserted per statement')
+        parser.add_argument('--password', default='benchmark123', help='Password shared by every seeded user')
+        parser.add_argument('--seed', type=float, default=0.5, help='Random seed in [-1, 1], for reproducible data')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['categories'] < 1 or options['orders'] < 0:
+            raise CommandError('--users and --categories must be positive, --orders cannot be negative')
+        if not -1 <= options['seed'] <= 1:
+            raise CommandError('--seed must be between -1 and 1')
+
+        start = time.perf_counter()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SELECT setseed(%s)', [options['seed']])
+            users = self.seed_users(cursor, options['users'], make_password(options['password']))
+            categories = self.seed_categories(cursor, options['categories'])
+            self.stdout.write(f'{users} users and {categories} categories ready')
+
+            for offset in range(0, options['orders'], options['batch_size']):
+                size = min(options['batch_size'], options['orders'] - offset)
+                self.seed_orders(cursor, size, users, categories)
+                self.stdout.write(f'{offset + size} orders inserted ({time.perf_counter() - start:.1f}s)')
+
+        bump_version()
+        with connection.cursor() as cursor:
+            for model in (User, Category, Order):
+                cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {options["orders"]} orders in {elapsed:.1f}s ({options["orders"] / max(elapsed, 1e-9):.0f} rows/s)'
+        ))
+
+    def seed_users(self, cursor, count, password):
+        # Seeded users are numbered in temporary tables so orders can pick
+        # their owner and category by position
+        cursor.execute(f'''
+            INSERT INTO {User._meta.db_table} (password, is_superuser, email, name, is_active, is_staff)
+            SELECT %s, false, format(%s, i), (%s::text[])[1 + i %% %s] || ' ' || (%s::text[])[1 + i / %s %% %s], true, false
+            FROM generate_series(1, %s) i
+            ON CONFLICT (email) DO NOTHING
+        ''', [
+            password, EMAIL_PATTERN, FIRST_NAMES, len(FIRST_NAMES),
+            LAST_NAMES, len(FIRST_NAMES), len(LAST_NAMES), count,
+        ])
+        cursor.execute(f'''
+            CREATE TEMPORARY TABLE seed_users ON COMMIT DROP AS
+            SELECT row_number() OVER (ORDER BY id) AS n, id FROM {User._meta.db_table}
+            WHERE email IN (SELECT format(%s, i) FROM generate_series(1, %s) i)
+        ''', [EMAIL_PATTERN, count])
+        cursor.execute('CREATE UNIQUE INDEX ON seed_users (n)')
+        return count
+
+    def seed_categories(self, cursor, count):
+        table = Category._meta.db_table
+        cursor.execute('''
+            CREATE TEMPORARY TABLE seed_categories ON COMMIT DROP AS
+            SELECT i AS n, (%s::text[])[1 + i %% %s] || ' ' || i AS name FROM generate_series(1, %s) i
+        ''', [CATEGORY_WORDS, len(CATEGORY_WORDS), count])
+        cursor.execute(f'''
+            INSERT INTO {table} (name)
+            SELECT name FROM seed_categories seed
+            WHERE NOT EXISTS (SELECT 1 FROM {table} category WHERE category.name = seed.name)
+            ORDER BY n
+        ''')
+        cursor.execute(f'''
+            ALTER TABLE seed_categories ADD COLUMN id bigint;
+            UPDATE seed_categories seed SET id = (
+                SELECT min(id) FROM {table} category WHERE category.name = seed.name
+            );
+            CREATE UNIQUE INDEX ON seed_categories (n);
+        ''')
+        return count
+
+    def seed_orders(self, cursor, size, users, categories):
+        cursor.execute(f'''
+            INSERT INTO {Order._meta.db_table} (
+                user_id, contact_name, contact_phone, description, real_state_agency,
+                company, deadline, category_id, updated_at
+            )
+            SELECT seed_users.id,
+                   (%(first_names)s::text[])[1 + (random() * 1000)::int %% %(first_count)s] || ' '
+                       || (%(last_names)s::text[])[1 + (random() * 1000)::int %% %(last_count)s],
+                   '+55' || lpad(((random() * 99999999999)::bigint)::text, 11, '0'),
+                   array_to_string(ARRAY(
+                       SELECT (%(description_words)s::text[])[1 + ((random() * 1000)::int + i + word) %% %(description_count)s]
+                       FROM generate_series(1, 6) word
+                   ), ' '),
+                   (%(agency_words)s::text[])[1 + (random() * 1000)::int %% %(agency_count)s] || ' ' || (random() * 500)::int,
+                   (%(company_words)s::text[])[1 + (random() * 1000)::int %% %(company_count)s] || ' ' || (random() * 5000)::int,
+                   current_date + (random() * 365)::int,
+                   seed_categories.id,
+                   now()
+            FROM (
+                SELECT i,
+                       1 + floor(power(random(), %(skew)s) * %(users)s)::int AS user_n,
+                       1 + floor(random() * %(categories)s)::int AS category_n
+                FROM generate_series(1, %(size)s) i
+            ) picks
+            JOIN seed_users ON seed_users.n = picks.user_n
+            JOIN seed_categories ON seed_categories.n = picks.category_n
+        ''', {
+            'first_names': FIRST_NAMES, 'first_count': len(FIRST_NAMES),
+            'last_names': LAST_NAMES, 'last_count': len(LAST_NAMES),
+            'description_words': DESCRIPTION_WORDS, 'description_count': len(DESCRIPTION_WORDS),
+            'agency_words': AGENCY_WORDS, 'agency_count': len(AGENCY_WORDS),
+            'company_words': COMPANY_WORDS, 'company_count': len(COMPANY_WORDS),
+            'skew': USER_SKEW, 'users': users, 'categories': categories, 'size': size,
+        })
@@ -0,0 +1,120 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+EMAIL = 'startup-report@example.com'
+
+# Runs in a fresh interpreter so nothing is imported or cached yet
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from core.management.commands.startup_report import first_requests
+print(json.dumps(first_requests(start, *sys.argv[1:])))
+'''
+
+
+def routes():
+    return {
+        'schema': reverse('api-schema'),
+        'category_list': reverse('category:category-list'),
+        'user_me': reverse('user:me'),
+        'order_list': reverse('order:order-list'),
+    }
+
+
+def first_requests(start, mode, token, host):
+    from django.test import Client
+    from core.warmup import connect, warm_up
+
+    report = {'setup_ms': round((time.perf_counter() - start) * 1000, 2), 'warmup_ms': {}, 'first_request_ms': {}}
+    if mode == 'warm':
+        report['warmup_ms'] = warm_up()
+        connect_start = time.perf_counter()
+        if connect():
+            report['warmup_ms']['connect'] = round((time.perf_counter() - connect_start) * 1000, 2)
+
+    client = Client(HTTP_HOST=host, HTTP_AUTHORIZATION=f'Token {token}')
+    for name, path in routes().items():
+        request_start = time.perf_counter()
+        response = client.get(path)
+        report['first_request_ms'][name] = round((time.perf_counter() - request_start) * 1000, 2)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} answered {response.status_code}')
+
+    return report
+
+
+def median_report(runs):
+    def median(values):
+        return round(statistics.median(values), 2)
+
+    first = runs[0]
+    return {
+        'setup_ms': median([run['setup_ms'] for run in runs]),
+        'warmup_ms': {name: median([run['warmup_ms'][name] for run in runs]) for name in first['warmup_ms']},
+        'first_request_ms': {
+            name: median([run['first_request_ms'][name] for run in runs]) for name in first['first_request_ms']
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = 'Measure process startup and first-request latency with and without the production warm-up'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Processes started per mode, medians are reported')
+        parser.add_argument('--host', default='localhost', help='Host header, must be in ALLOWED_HOSTS')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be positive')
+
+        user = get_user_model().objects.create_user(email=EMAIL, password=None)
+        try:
+            token = Token.objects.create(user=user).key
+            report = {
+                mode: median_report([self.run(mode, token, options['host']) for _ in range(options['runs'])])
+                for mode in ('cold', 'warm')
+            }
+        finally:
+            user.delete()
+
+        # Workers only open a connection up front in the persistent and pool modes
+        report['db_pool_mode'] = settings.DB_POOL_MODE
+        for mode in ('cold', 'warm'):
+            timings = report[mode]
+            report[mode]['total_ms'] = round(
+                timings['setup_ms'] + sum(timings['warmup_ms'].values()) + sum(timings['first_request_ms'].values()), 2,
+            )
+
+        content = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(content + '\n')
+        else:
+            self.stdout.write(content)
+
+    def run(self, mode, token, host):
+        # The child process must see the same database as this one
+        env = {**os.environ, 'DB_NAME': connection.settings_dict['NAME']}
+        try:
+            output = subprocess.run(
+                [sys.executable, '-c', SCRIPT, mode, token, host], cwd=settings.BASE_DIR, env=env,
+                capture_output=True, text=True, check=True,
+            )
+        except subprocess.CalledProcessError as error:
+            raise CommandError(f'{mode} run failed:\n{error.stderr}')
+
+        return json.loads(output.stdout.strip().splitlines()[-1])
@@ -0,0 +1,101 @@
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from core.backends.postgresql.base import pool_stats
+from user.authentication import tokens
+
+# With PROMETHEUS_MULTIPROC_DIR set, every worker process writes its samples
+# to memory-mapped files in that directory and a scrape of any worker sums
+# them. Gauges add up the values of the workers that are still alive.
+MULTIPROCESS = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+# Pool and auth cache gauges are refreshed at most this often per worker
+GAUGE_INTERVAL = 1.0
+
+REQUESTS = Counter('http_requests_total', 'Requests served', ['route', 'method', 'status'])
+LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency', ['route', 'method'], buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size, streaming responses excluded', ['route'],
+    buckets=SIZE_BUCKETS,
+)
+DB_QUERIES = Histogram('http_request_db_queries', 'SQL queries per request', ['route'], buckets=QUERY_BUCKETS)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'SQL time per request', ['route'], buckets=LATENCY_BUCKETS,
+)
+AUTH_CACHE = Gauge(
+    'auth_token_cache', 'In-process token cache entries, hits and misses', ['stat'], multiprocess_mode='livesum',
+)
+DB_POOL = Gauge(
+    'db_pool', 'Connection pool state per database alias', ['alias', 'stat'], multiprocess_mode='livesum',
+)
+LOGIN_HASH_QUEUE_TIME = Histogram(
+    'login_hash_queue_seconds', 'Time logins wait for a password hashing thread', buckets=LATENCY_BUCKETS,
+)
+LOGIN_HASH_REJECTED = Counter('login_hash_rejected_total', 'Logins refused because every hashing slot was taken')
+JOBS = Counter('jobs_processed_total', 'Background jobs run, by outcome', ['name', 'status'])
+JOB_DURATION = Histogram('job_duration_seconds', 'Background job run time', ['name'], buckets=LATENCY_BUCKETS)
+
+next_refresh = 0.0
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else 'unmatched'
+
+
+def observe(request, response, duration):
+    route = route_name(request)
+    REQUESTS.labels(route, request.method, response.status_code).inc()
+    LATENCY.labels(route, request.method).observe(duration)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(route).observe(len(response.content))
+
+    counter = getattr(request, 'query_counter', None)
+    if counter is not None:
+        DB_QUERIES.labels(route).observe(counter.count)
+        DB_DURATION.labels(route).observe(counter.duration)
+
+    refresh_gauges()
+
+
+def refresh_gauges(force=False):
+    global next_refresh
+
+    now = time.monotonic()
+    if not force and now < next_refresh:
+        return
+    next_refresh = now + GAUGE_INTERVAL
+
+    AUTH_CACHE.labels('entries').set(len(tokens))
+    AUTH_CACHE.labels('hits').set(tokens.hits)
+    AUTH_CACHE.labels('misses').set(tokens.misses)
+    for alias, stats in pool_stats().items():
+        for stat, value in stats.items():
+            DB_POOL.labels(alias, stat).set(value)
+
+
+def render():
+    """Return ``(body, content_type)`` for a scrape of every worker's metrics."""
+    refresh_gauges(force=True)
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
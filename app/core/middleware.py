@@ -0,0 +1,192 @@
+import asyncio
+import cProfile
+import logging
+import os
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from core import metrics, profiling
+from core.queries import count_queries
+
+logger = logging.getLogger(__name__)
+
+
+class HybridMiddleware:
+    """
+    Base for middleware running in the mode of the handler chain, so an ASGI
+    request is not moved to a thread at the top of the stack. Subclasses
+    implement ``__acall__`` next to ``__call__``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Same marker as Django's MiddlewareMixin, the handler then awaits
+            # this instance directly
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+
+class QueryCountMiddleware(HybridMiddleware):
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        with count_queries() as counter:
+            request.query_counter = counter
+            response = self.get_response(request)
+
+        return self.add_headers(request, response, counter)
+
+    async def __acall__(self, request):
+        with count_queries() as counter:
+            request.query_counter = counter
+            response = await self.get_response(request)
+
+        return self.add_headers(request, response, counter)
+
+    def add_headers(self, request, response, counter):
+        response['X-DB-Query-Count'] = str(counter.count)
+        response['X-DB-Query-Time'] = '%.2f' % (counter.duration * 1000)
+
+        if counter.count > settings.QUERY_BUDGET:
+            logger.warning(
+                'Query budget exceeded on %s %s: %d queries (budget %d) in %.2fms',
+                request.method,
+                request.path,
+                counter.count,
+                settings.QUERY_BUDGET,
+                counter.duration * 1000,
+            )
+
+        return response
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """
+    Record latency, status, response size and SQL usage per route. Sits
+    outside QueryCountMiddleware so the request's query counter is final.
+    """
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        metrics.observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        metrics.observe(request, response, time.perf_counter() - start)
+        return response
+
+
+class ProfilingMiddleware(HybridMiddleware):
+    """
+    Add a Server-Timing breakdown to requests carrying an ``X-Profile``
+    header, and with a signed ``cprofile`` header also write a cProfile dump
+    to PROFILING_DIR. Requests without the header only pay a header lookup.
+    Under ASGI the dump only covers the event loop thread.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.is_async:
+            # The handler runs sync hooks through sync_to_async, a thread hop
+            # on every request; coroutine ones are awaited in place
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        requested = profiling.requested_mode(request)
+        if requested is None:
+            return self.get_response(request)
+
+        mode, signed = requested
+        timing, profiler = self.start(request, mode)
+        with self.profile(timing, profiler):
+            response = self.get_response(request)
+
+        return self.finish(request, response, signed, timing, profiler)
+
+    async def __acall__(self, request):
+        requested = profiling.requested_mode(request)
+        if requested is None:
+            return await self.get_response(request)
+
+        mode, signed = requested
+        timing, profiler = self.start(request, mode)
+        with self.profile(timing, profiler):
+            response = await self.get_response(request)
+
+        return self.finish(request, response, signed, timing, profiler)
+
+    def start(self, request, mode):
+        timing = profiling.ServerTiming()
+        request.server_timing = timing
+        profiler = cProfile.Profile() if mode == profiling.CPROFILE and settings.PROFILING_DIR else None
+        return timing, profiler
+
+    @contextmanager
+    def profile(self, timing, profiler):
+        token = profiling.active.set(timing)
+        try:
+            with count_queries(counter=timing.queries):
+                timing.mark('start')
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    yield
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+                timing.mark('end')
+        finally:
+            profiling.active.reset(token)
+
+    def finish(self, request, response, signed, timing, profiler):
+        # Token authentication runs inside the view, so the user is only
+        # known once the response exists
+        user = getattr(request, 'user', None)
+        if not signed and not (user is not None and user.is_staff):
+            return response
+
+        if 'view_end' not in timing.marks:
+            timing.marks['view_end'] = timing.marks['render_end'] = timing.marks['end']
+        response['Server-Timing'] = timing.header()
+
+        if profiler is not None:
+            name = profiling.dump_name(request)
+            os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+            profiler.dump_stats(os.path.join(settings.PROFILING_DIR, name))
+            response['X-Profile-Dump'] = name
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = getattr(request, 'server_timing', None)
+        if timing is not None:
+            timing.mark('view')
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        ProfilingMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, 'server_timing', None)
+        if timing is not None:
+            timing.mark('view_end')
+            response.add_post_render_callback(lambda rendered: timing.mark('render_end'))
+
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return ProfilingMiddleware.process_template_response(self, request, response)
+
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-17 17:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = '''
+CREATE FUNCTION core_order_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.contact_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.company, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.real_state_agency, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_order_search_vector
+    BEFORE INSERT OR UPDATE OF contact_name, company, real_state_agency, description, search_vector
+    ON core_order FOR EACH ROW EXECUTE PROCEDURE core_order_search_vector();
+
+UPDATE core_order SET search_vector = NULL;
+'''
+
+DROP_SEARCH_VECTOR_SQL = '''
+DROP TRIGGER core_order_search_vector ON core_order;
+DROP FUNCTION core_order_search_vector();
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_order_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, DROP_SEARCH_VECTOR_SQL),
+        migrations.AddIndex(
+            model_name='order',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='order_search_idx'),
+        ),
+    ]
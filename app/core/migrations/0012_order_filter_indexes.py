@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-17 18:05
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_order_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'category', 'id'], name='order_user_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'company', 'id'], name='order_user_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'real_state_agency', 'id'], name='order_user_agency_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(django.db.models.expressions.F('user'), django.db.models.expressions.Func(django.db.models.expressions.F('contact_phone'), django.db.models.expressions.Value('[^0-9]'), django.db.models.expressions.Value(''), django.db.models.expressions.Value('g'), function='regexp_replace'), django.db.models.expressions.F('id'), name='order_user_phone_idx'),
+        ),
+    ]
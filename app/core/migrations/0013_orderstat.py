@@ -0,0 +1,99 @@
+# Generated by Django 3.2.25 on 2026-10-17 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+ORDER_STATS_SQL = '''
+CREATE FUNCTION core_order_stats() RETURNS trigger AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT user_id, category_id, deadline, company, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT user_id, category_id, deadline, company, -1 AS delta FROM old_rows'
+        ELSE
+            'SELECT user_id, category_id, deadline, company, 1 AS delta FROM new_rows
+             UNION ALL
+             SELECT user_id, category_id, deadline, company, -1 AS delta FROM old_rows'
+    END;
+
+    -- Rows are merged in key order so concurrent writers lock them alike
+    EXECUTE format($sql$
+        INSERT INTO core_orderstat (user_id, dimension, key, count)
+        SELECT user_id, dimension, key, delta FROM (
+            SELECT user_id, 'category' AS dimension, category_id::text AS key, sum(delta) AS delta
+            FROM (%1$s) changed GROUP BY 1, 3
+            UNION ALL
+            SELECT user_id, 'week', to_char(date_trunc('week', deadline), 'YYYY-MM-DD'), sum(delta)
+            FROM (%1$s) changed GROUP BY 1, 3
+            UNION ALL
+            SELECT user_id, 'company', company, sum(delta)
+            FROM (%1$s) changed GROUP BY 1, 3
+        ) deltas
+        WHERE delta <> 0
+        ORDER BY user_id, dimension, key
+        ON CONFLICT (user_id, dimension, key) DO UPDATE SET count = core_orderstat.count + EXCLUDED.count
+    $sql$, changed);
+
+    EXECUTE format(
+        'DELETE FROM core_orderstat WHERE count = 0 AND user_id IN (SELECT user_id FROM (%s) changed)',
+        changed
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_order_stats_insert AFTER INSERT ON core_order
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE core_order_stats();
+
+CREATE TRIGGER core_order_stats_update AFTER UPDATE ON core_order
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE core_order_stats();
+
+CREATE TRIGGER core_order_stats_delete AFTER DELETE ON core_order
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE PROCEDURE core_order_stats();
+
+INSERT INTO core_orderstat (user_id, dimension, key, count)
+SELECT user_id, 'category', category_id::text, count(*) FROM core_order GROUP BY 1, 3
+UNION ALL
+SELECT user_id, 'week', to_char(date_trunc('week', deadline), 'YYYY-MM-DD'), count(*) FROM core_order GROUP BY 1, 3
+UNION ALL
+SELECT user_id, 'company', company, count(*) FROM core_order GROUP BY 1, 3;
+'''
+
+DROP_ORDER_STATS_SQL = '''
+DROP TRIGGER core_order_stats_insert ON core_order;
+DROP TRIGGER core_order_stats_update ON core_order;
+DROP TRIGGER core_order_stats_delete ON core_order;
+DROP FUNCTION core_order_stats();
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_order_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('category', 'Category'), ('week', 'Deadline week'), ('company', 'Company')], max_length=16)),
+                ('key', models.CharField(max_length=255)),
+                ('count', models.IntegerField()),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='orderstat',
+            constraint=models.UniqueConstraint(fields=('user', 'dimension', 'key'), name='orderstat_user_dimension_key'),
+        ),
+        migrations.RunSQL(ORDER_STATS_SQL, DROP_ORDER_STATS_SQL),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 3.2.25 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+ORDER_STATS_SQL = '''
+CREATE OR REPLACE FUNCTION core_order_stats() RETURNS trigger AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT user_id, category_id, deadline, company, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT user_id, category_id, deadline, company, -1 AS delta FROM old_rows'
+        ELSE
+            'SELECT user_id, category_id, deadline, company, 1 AS delta FROM new_rows
+             UNION ALL
+             SELECT user_id, category_id, deadline, company, -1 AS delta FROM old_rows'
+    END;
+
+    -- Rows are merged in key order so concurrent writers lock them alike
+    EXECUTE format($sql$
+        INSERT INTO core_orderstat (user_id, dimension, key, count)
+        SELECT user_id, dimension, key, delta FROM (
+            SELECT user_id, 'total' AS dimension, '' AS key, sum(delta) AS delta
+            FROM (%1$s) changed GROUP BY 1
+            UNION ALL
+            SELECT user_id, 'category', category_id::text, sum(delta)
+            FROM (%1$s) changed GROUP BY 1, 3
+            UNION ALL
+            SELECT user_id, 'week', to_char(date_trunc('week', deadline), 'YYYY-MM-DD'), sum(delta)
+            FROM (%1$s) changed GROUP BY 1, 3
+            UNION ALL
+            SELECT user_id, 'company', company, sum(delta)
+            FROM (%1$s) changed GROUP BY 1, 3
+        ) deltas
+        WHERE delta <> 0
+        ORDER BY user_id, dimension, key
+        ON CONFLICT (user_id, dimension, key) DO UPDATE SET count = core_orderstat.count + EXCLUDED.count
+    $sql$, changed);
+
+    EXECUTE format(
+        'DELETE FROM core_orderstat WHERE count = 0 AND user_id IN (SELECT user_id FROM (%s) changed)',
+        changed
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+INSERT INTO core_orderstat (user_id, dimension, key, count)
+SELECT user_id, 'total', '', count(*) FROM core_order GROUP BY 1;
+'''
+
+PREVIOUS_ORDER_STATS_SQL = '''
+CREATE OR REPLACE FUNCTION core_order_stats() RETURNS trigger AS $$
+DECLARE
+    changed text;
+BEGIN
+    changed := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT user_id, category_id, deadline, company, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT user_id, category_id, deadline, company, -1 AS delta FROM old_rows'
+        ELSE
+            'SELECT user_id, category_id, deadline, company, 1 AS delta FROM new_rows
+             UNION ALL
+             SELECT user_id, category_id, deadline, company, -1 AS delta FROM old_rows'
+    END;
+
+    -- Rows are merged in key order so concurrent writers lock them alike
+    EXECUTE format($sql$
+        INSERT INTO core_orderstat (user_id, dimension, key, count)
+        SELECT user_id, dimension, key, delta FROM (
+            SELECT user_id, 'category' AS dimension, category_id::text AS key, sum(delta) AS delta
+            FROM (%1$s) changed GROUP BY 1, 3
+            UNION ALL
+            SELECT user_id, 'week', to_char(date_trunc('week', deadline), 'YYYY-MM-DD'), sum(delta)
+            FROM (%1$s) changed GROUP BY 1, 3
+            UNION ALL
+            SELECT user_id, 'company', company, sum(delta)
+            FROM (%1$s) changed GROUP BY 1, 3
+        ) deltas
+        WHERE delta <> 0
+        ORDER BY user_id, dimension, key
+        ON CONFLICT (user_id, dimension, key) DO UPDATE SET count = core_orderstat.count + EXCLUDED.count
+    $sql$, changed);
+
+    EXECUTE format(
+        'DELETE FROM core_orderstat WHERE count = 0 AND user_id IN (SELECT user_id FROM (%s) changed)',
+        changed
+    );
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DELETE FROM core_orderstat WHERE dimension = 'total';
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_orderstat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderstat',
+            name='dimension',
+            field=models.CharField(choices=[('total', 'Total'), ('category', 'Category'), ('week', 'Deadline week'), ('company', 'Company')], max_length=16),
+        ),
+        migrations.RunSQL(ORDER_STATS_SQL, PREVIOUS_ORDER_STATS_SQL),
+    ]
@@ -1,6 +1,10 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from core.util import phone_regex, validate_deadline
+from django.db.models import F
+from django.utils import timezone
+from core.util import normalized_phone, phone_regex, validate_deadline
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -50,6 +54,7 @@ class Order(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
     )
     contact_name = models.CharField(max_length=255)
     contact_phone = models.CharField(validators=[phone_regex], max_length=17)
@@ -58,6 +63,101 @@ class Order(models.Model):
     company = models.CharField(max_length=255)
     deadline = models.DateField(validators=[validate_deadline])
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the core_order_search_vector trigger, see migration 0011
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='order_user_id_idx'),
+            models.Index(fields=['user', 'deadline', 'id'], name='order_user_deadline_idx'),
+            models.Index(fields=['user', 'updated_at'], name='order_user_updated_idx'),
+            GinIndex(fields=['search_vector'], name='order_search_idx'),
+            models.Index(fields=['user', 'category', 'id'], name='order_user_category_idx'),
+            models.Index(fields=['user', 'company', 'id'], name='order_user_company_idx'),
+            models.Index(fields=['user', 'real_state_agency', 'id'], name='order_user_agency_idx'),
+            models.Index(F('user'), normalized_phone(), F('id'), name='order_user_phone_idx'),
+        ]
 
     def __str__(self):
-        return self.description
\ No newline at end of file
+        return self.description
+
+    def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
+        # Updates leave search_vector to the trigger instead of writing back
+        # the value read with the row
+        if update_fields is None and not force_insert and not self._state.adding:
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'search_vector' and field.attname not in deferred
+            ]
+
+        super().save(force_insert=force_insert, force_update=force_update, using=using, update_fields=update_fields)
+
+
+class OrderStat(models.Model):
+    TOTAL = 'total'
+    CATEGORY = 'category'
+    WEEK = 'week'
+    COMPANY = 'company'
+    DIMENSIONS = [
+        (TOTAL, 'Total'),
+        (CATEGORY, 'Category'),
+        (WEEK, 'Deadline week'),
+        (COMPANY, 'Company'),
+    ]
+
+    # Rows are written by the core_order_stats triggers, see migration 0014,
+    # and disappear with the last order they count
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+    )
+    dimension = models.CharField(max_length=16, choices=DIMENSIONS)
+    key = models.CharField(max_length=255)
+    count = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'dimension', 'key'], name='orderstat_user_dimension_key'),
+        ]
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    queue = models.CharField(max_length=64, default='default')
+    name = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim from these, finished jobs stay out of the indexes
+            models.Index(
+                fields=['queue', 'run_at', 'id'], name='job_claim_idx', condition=models.Q(status='queued'),
+            ),
+            models.Index(fields=['locked_at'], name='job_running_idx', condition=models.Q(status='running')),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
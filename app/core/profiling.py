@@ -0,0 +1,107 @@
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from django.conf import settings
+from django.core import signing
+from core.queries import QueryCounter
+
+HEADER = 'HTTP_X_PROFILE'
+SIGNING_SALT = 'core.profiling'
+
+TIMING = 'timing'
+CPROFILE = 'cprofile'
+MODES = (TIMING, CPROFILE)
+
+active = ContextVar('server_timing', default=None)
+
+
+def sign_mode(mode):
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign(mode)
+
+
+def requested_mode(request):
+    """
+    Return ``(mode, signed)`` for a request asking to be profiled, ``None``
+    otherwise. Unsigned requests may only ask for timings, and only get them
+    when they turn out to come from a staff user.
+    """
+    value = request.META.get(HEADER)
+    if value is None:
+        return None
+
+    try:
+        mode = signing.TimestampSigner(salt=SIGNING_SALT).unsign(value, max_age=settings.PROFILING_SIGNATURE_MAX_AGE)
+    except signing.BadSignature:
+        return (TIMING, False) if value == TIMING else None
+
+    return (mode, True) if mode in MODES else None
+
+
+def measure(name):
+    """Time a block into the current request's Server-Timing, if it has one."""
+    timing = active.get()
+    return timing.measure(name) if timing is not None else nullcontext()
+
+
+def dump_name(request):
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+    return f'{time.strftime("%Y%m%dT%H%M%S")}-{request.method}-{slug}-{time.perf_counter_ns() % 10 ** 6}.prof'
+
+
+class ServerTiming:
+    def __init__(self):
+        self.queries = QueryCounter()
+        self.durations = defaultdict(float)
+        # Database time spent inside each measured block, so it is not
+        # counted twice when the view time is split up
+        self.block_queries = defaultdict(float)
+        self.marks = {}
+
+    @contextmanager
+    def measure(self, name):
+        start, queries = time.perf_counter(), self.queries.duration
+        try:
+            yield
+        finally:
+            self.durations[name] += time.perf_counter() - start
+            self.block_queries[name] += self.queries.duration - queries
+
+    def mark(self, name):
+        self.marks[name] = (time.perf_counter(), self.queries.duration)
+
+    def elapsed(self, start, end):
+        if start not in self.marks or end not in self.marks:
+            return 0.0, 0.0
+
+        return (
+            self.marks[end][0] - self.marks[start][0],
+            self.marks[end][1] - self.marks[start][1],
+        )
+
+    def metrics(self):
+        view, view_queries = self.elapsed('view', 'view_end')
+        render, _ = self.elapsed('view_end', 'render_end')
+        total, _ = self.elapsed('start', 'end')
+        auth = self.durations['auth']
+        # Whatever the view spends outside authentication and SQL is building
+        # the response data
+        serialize = view - auth - (view_queries - self.block_queries['auth'])
+        return [
+            ('auth', auth, None),
+            ('db', self.queries.duration, f'{self.queries.count} queries'),
+            ('serialize', max(serialize, 0.0), None),
+            ('render', render, None),
+            ('total', total, None),
+        ]
+
+    def header(self):
+        entries = []
+        for name, duration, description in self.metrics():
+            entry = f'{name};dur={duration * 1000:.2f}'
+            if description:
+                entry += f';desc="{description}"'
+            entries.append(entry)
+
+        return ', '.join(entries)
@@ -0,0 +1,62 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Counters of the enclosing count_queries() blocks. The context travels with
+# the request into sync_to_async threads and the async-db executor, so the
+# queries those threads run are counted as well.
+active = ContextVar('query_counters', default=())
+
+
+class QueryCounter:
+    def __init__(self, record_sql=False):
+        self.count = 0
+        self.duration = 0.0
+        self.record_sql = record_sql
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            if self.record_sql:
+                self.statements.append(sql)
+
+
+def record(execute, sql, params, many, context):
+    for counter in active.get():
+        execute = partial(counter, execute)
+    return execute(sql, params, many, context)
+
+
+def install(connection):
+    # First in line, execute_wrapper() blocks pop their own wrapper off the end
+    if record not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record)
+
+
+def install_on_connect(sender, connection, **kwargs):
+    install(connection)
+
+
+connection_created.connect(install_on_connect)
+
+
+@contextmanager
+def count_queries(record_sql=False, counter=None):
+    counter = counter if counter is not None else QueryCounter(record_sql=record_sql)
+    # Connections of this thread may predate the signal receiver
+    for connection in connections.all():
+        install(connection)
+
+    token = active.set(active.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        active.reset(token)
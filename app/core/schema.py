@@ -0,0 +1,116 @@
+import hashlib
+import os
+import threading
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.translation import get_supported_language_variant
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+# Formats written by build_schema, named schema.<format>
+RENDERERS = (OpenApiYamlRenderer, OpenApiJsonRenderer)
+
+schemas = {}
+lock = threading.Lock()
+
+
+def schema_path(directory, format):
+    return os.path.join(directory, f'schema.{format}')
+
+
+def generate(request=None, urlconf=None, api_version=None, public=True):
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(urlconf=urlconf, api_version=api_version)
+    return generator.get_schema(request=request, public=public)
+
+
+def load_prebuilt(format):
+    if not settings.OPENAPI_SCHEMA_DIR:
+        return None
+
+    try:
+        with open(schema_path(settings.OPENAPI_SCHEMA_DIR, format), 'rb') as schema_file:
+            return schema_file.read()
+    except FileNotFoundError:
+        return None
+
+
+def store(key, content):
+    schemas[key] = (content, quote_etag(hashlib.md5(content).hexdigest()))
+    return schemas[key]
+
+
+def warm():
+    """Fill the cache for every format in the default language."""
+    data = None
+    with lock:
+        for renderer_class in RENDERERS:
+            key = (renderer_class.format, None)
+            if key in schemas:
+                continue
+
+            content = load_prebuilt(renderer_class.format)
+            if content is None:
+                data = data if data is not None else generate()
+                content = renderer_class().render(data, renderer_class.media_type, {})
+            store(key, content)
+
+
+def clear():
+    with lock:
+        schemas.clear()
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """
+    Serve the OpenAPI schema from memory. Each format and language is
+    introspected once per process, or read from OPENAPI_SCHEMA_DIR when
+    build_schema has written it there.
+    """
+
+    def _get_schema_response(self, request):
+        content, etag = self.get_content(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=self.get_content_type(request.accepted_renderer))
+
+        response['ETag'] = etag
+        return response
+
+    def get_content_type(self, renderer):
+        if renderer.charset:
+            return f'{renderer.media_type}; charset={renderer.charset}'
+
+        return renderer.media_type
+
+    def get_language(self, request):
+        lang = request.GET.get('lang') if settings.USE_I18N else None
+        if not lang:
+            return None
+
+        # Any other value is rendered in the default language, caching it
+        # under its own key would let clients fill memory with copies
+        try:
+            lang = get_supported_language_variant(lang)
+        except LookupError:
+            return None
+
+        return None if lang == get_supported_language_variant(settings.LANGUAGE_CODE) else lang
+
+    def get_content(self, request):
+        format = request.accepted_renderer.format
+        # Prebuilt files hold the default language only
+        lang = self.get_language(request)
+        key = (format, lang)
+        with lock:
+            if key not in schemas:
+                content = None if lang else load_prebuilt(format)
+                if content is None:
+                    data = generate(request, self.urlconf, self.api_version, self.serve_public)
+                    renderer = request.accepted_renderer
+                    content = renderer.render(data, renderer.media_type, self.get_renderer_context())
+                store(key, content)
+
+            return schemas[key]
@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from functools import wraps
+from core.queries import count_queries
+
+
+def format_statements(counter):
+    return '\n'.join(f'{index}. {sql}' for index, sql in enumerate(counter.statements, start=1))
+
+
+def query_budget(max_queries):
+    def decorator(test_method):
+        @wraps(test_method)
+        def wrapper(self, *args, **kwargs):
+            with count_queries(record_sql=True) as counter:
+                result = test_method(self, *args, **kwargs)
+
+            if counter.count > max_queries:
+                self.fail(
+                    f'{counter.count} queries executed, budget is {max_queries}\n'
+                    f'{format_statements(counter)}'
+                )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetMixin:
+    @contextmanager
+    def assertMaxQueries(self, max_queries):
+        with count_queries(record_sql=True) as counter:
+            yield counter
+
+        if counter.count > max_queries:
+            self.fail(
+                f'{counter.count} queries executed, budget is {max_queries}\n'
+                f'{format_statements(counter)}'
+            )
+
+    def assertConstantQueries(self, request, grow, sizes=(1, 5)):
+        counts = {}
+        created = 0
+        for size in sizes:
+            grow(size - created)
+            created = size
+
+            with count_queries(record_sql=True) as counter:
+                request()
+            counts[size] = counter
+
+        if len({counter.count for counter in counts.values()}) > 1:
+            details = '\n\n'.join(
+                f'{size} rows, {counter.count} queries:\n{format_statements(counter)}'
+                for size, counter in counts.items()
+            )
+            self.fail(f'Query count grows with result size\n{details}')
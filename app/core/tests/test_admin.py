@@ -1,7 +1,11 @@
-from django.test import TestCase
+from datetime import date
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.urls import reverse
 from django.test import Client
+from core.admin import EstimatedCountPaginator
+from core.models import Category, Order
 
 class AdminSiteTests(TestCase):
     def setUp(self):
@@ -35,3 +39,36 @@ class AdminSiteTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
+
+    def create_orders(self, count):
+        category = Category.objects.create(name='Truck')
+        Order.objects.bulk_create(
+            Order(user=self.user, category=category, contact_name='Name', contact_phone='839913829147',
+                  description='Description', real_state_agency='Sigma', company='Arasaka', deadline=date(2030, 1, 1))
+            for _ in range(count)
+        )
+
+    def test_users_list_shows_order_count(self):
+        self.create_orders(3)
+
+        response = self.client.get(reverse('admin:core_user_changelist'))
+
+        self.assertEqual(response.context['cl'].result_list.get(pk=self.user.pk).order_count, 3)
+
+    def test_orders_list(self):
+        self.create_orders(2)
+
+        response = self.client.get(reverse('admin:core_order_changelist'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1)
+    def test_unfiltered_count_is_estimated(self):
+        self.create_orders(5)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_order')
+        Order.objects.filter(pk__in=list(Order.objects.values_list('pk', flat=True)[:2])).delete()
+
+        self.assertEqual(EstimatedCountPaginator(Order.objects.order_by('id'), 10).count, 5)
+        self.assertEqual(EstimatedCountPaginator(Order.objects.filter(user=self.user).order_by('id'), 10).count, 3)
@@ -0,0 +1,78 @@
+import io
+import json
+import os
+import tempfile
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+from category import cache as category_cache
+from core.models import Category, Order
+from order.stats import find_inconsistencies
+
+
+class SeedOrdersCommandTests(TransactionTestCase):
+    def seed(self, **options):
+        call_command('seed_orders', users=5, categories=3, orders=120, batch_size=50, stdout=io.StringIO(), **options)
+
+    def test_seeds_requested_rows(self):
+        self.seed()
+
+        self.assertEqual(get_user_model().objects.filter(email__startswith='seed-').count(), 5)
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Order.objects.count(), 120)
+        self.assertTrue(get_user_model().objects.get(email='seed-1@example.com').check_password('benchmark123'))
+        self.assertEqual(find_inconsistencies(), [])
+
+    def test_rerun_reuses_users_and_categories(self):
+        self.seed()
+        self.seed()
+
+        self.assertEqual(get_user_model().objects.count(), 5)
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Order.objects.count(), 240)
+
+    def test_rejects_invalid_seed(self):
+        with self.assertRaises(CommandError):
+            self.seed(seed=2)
+
+
+class BenchmarkApiCommandTests(TransactionTestCase):
+    def setUp(self):
+        call_command('seed_orders', users=3, categories=2, orders=30, stdout=io.StringIO())
+
+    def test_report_covers_every_route_and_rolls_back(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'report.json')
+            call_command('benchmark_api', requests=2, warmup=0, host='testserver', output=path, stdout=io.StringIO())
+            with open(path) as report_file:
+                report = json.load(report_file)
+
+            errors = io.StringIO()
+            call_command('benchmark_api', requests=2, warmup=0, host='testserver', compare=path, stdout=io.StringIO(), stderr=errors)
+
+        self.assertEqual(set(report['routes']), {
+            'token', 'user_me', 'order_list', 'order_detail', 'order_create', 'order_update', 'category_list',
+        })
+        for name, route in report['routes'].items():
+            self.assertEqual(route['requests'], 2, name)
+            self.assertTrue(all(status.startswith('2') for status in route['status']), name)
+            self.assertIn('p99', route['latency_ms'])
+        self.assertIn('order_list', errors.getvalue())
+        self.assertEqual(Order.objects.count(), 30)
+        self.assertFalse(Order.objects.filter(company='Benchmark Updated').exists())
+
+    def test_write_requests_run_on_commit_hooks(self):
+        category_cache.categories.clear()
+
+        call_command('benchmark_api', requests=2, warmup=0, host='testserver', stdout=io.StringIO())
+
+        # Order creation caches the category it resolved once its write commits
+        self.assertEqual(len(category_cache.categories), 1)
+        self.assertEqual(Order.objects.count(), 30)
+
+    def test_requires_orders(self):
+        get_user_model().objects.create_user(email='empty@example.com', password='benchmark123')
+
+        with self.assertRaises(CommandError):
+            call_command('benchmark_api', email='empty@example.com', requests=1, warmup=0, stdout=io.StringIO())
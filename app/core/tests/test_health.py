@@ -0,0 +1,66 @@
+from unittest.mock import patch
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from core import health
+
+LIVENESS_URL = reverse('liveness')
+READINESS_URL = reverse('readiness')
+
+
+class ReadinessTests(TestCase):
+    def setUp(self):
+        health.reset()
+        self.addCleanup(health.reset)
+
+    def test_ready_when_database_answers(self):
+        response = self.client.get(READINESS_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], health.OK)
+        self.assertTrue(response.json()['checks']['database']['ok'])
+        self.assertEqual(response.json()['checks']['migrations'], {'ok': True, 'pending': 0})
+
+    def test_result_is_cached(self):
+        self.client.get(READINESS_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(READINESS_URL)
+
+        self.assertEqual(response.json()['status'], health.OK)
+
+    @override_settings(READINESS_CACHE_TTL=0)
+    def test_expired_result_checks_again(self):
+        self.client.get(READINESS_URL)
+
+        # Migrations are only checked until they are all applied
+        with self.assertNumQueries(1):
+            self.client.get(READINESS_URL)
+
+    @override_settings(READINESS_DB_LATENCY_THRESHOLD=-1)
+    def test_slow_database_is_degraded_but_ready(self):
+        response = self.client.get(READINESS_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], health.DEGRADED)
+
+    def test_unreachable_database_is_unavailable(self):
+        with patch.object(connection, 'cursor', side_effect=OperationalError('connection refused')):
+            response = self.client.get(READINESS_URL)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], health.UNAVAILABLE)
+        self.assertEqual(response.json()['checks']['database'], {'ok': False, 'error': 'connection refused'})
+
+    def test_pending_migrations_are_unavailable(self):
+        with patch('core.health.MigrationExecutor.migration_plan', return_value=[('core', '9999_pending')]):
+            response = self.client.get(READINESS_URL)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['migrations'], {'ok': False, 'pending': 1})
+
+    def test_liveness_does_not_touch_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(LIVENESS_URL)
+
+        self.assertEqual(response.status_code, 200)
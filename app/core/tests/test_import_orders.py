@@ -0,0 +1,161 @@
+import csv
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from core.models import Category, Order
+
+CSV_HEADER = ['contact_name', 'contact_phone', 'description', 'real_state_agency', 'company', 'deadline', 'category_name']
+
+
+def future_deadline():
+    return (date.today() + timedelta(days=30)).isoformat()
+
+
+class ImportOrdersCommandTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123'
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', newline='', encoding='utf-8') as target:
+            target.write(content)
+
+        return path
+
+    def write_csv(self, rows, header=CSV_HEADER):
+        path = os.path.join(self.directory.name, 'orders.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.writer(target)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+        return path
+
+    def read_rejects(self, path):
+        with open(f'{path}.rejects.csv', newline='', encoding='utf-8') as rejects:
+            return list(csv.DictReader(rejects))
+
+    def test_import_csv(self):
+        Category.objects.create(name='Truck')
+        path = self.write_csv([
+            ['Contactor', '839913324234', 'First, "quoted"', 'Sigma', 'Arasaka', future_deadline(), 'Truck'],
+            ['Contactor', '+18399133242', 'Second', 'Sigma', 'Militech', future_deadline(), 'Cargo'],
+        ])
+
+        call_command('import_orders', path, user=self.user.email, stdout=open(os.devnull, 'w'))
+
+        orders = Order.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([order.description for order in orders], ['First, "quoted"', 'Second'])
+        self.assertEqual([order.category.name for order in orders], ['Truck', 'Cargo'])
+        self.assertEqual(Category.objects.filter(name='Truck').count(), 1)
+        self.assertFalse(os.path.exists(f'{path}.rejects.csv'))
+
+    def test_import_ndjson(self):
+        items = [
+            {
+                'contact_name': 'Contactor',
+                'contact_phone': '839913324234',
+                'description': 'Exported',
+                'real_state_agency': 'Sigma',
+                'company': 'Arasaka',
+                'deadline': future_deadline(),
+                'category': {'id': 1, 'name': 'Cargo'},
+            },
+            {
+                'contact_name': 'Contactor',
+                'contact_phone': '839913324234',
+                'description': 'Plain category',
+                'real_state_agency': 'Sigma',
+                'company': 'Arasaka',
+                'deadline': future_deadline(),
+                'category': 'Truck',
+            },
+        ]
+        path = self.write_file('orders.ndjson', ''.join(json.dumps(item) + '\n' for item in items))
+
+        call_command('import_orders', path, user=self.user.email, stdout=open(os.devnull, 'w'))
+
+        orders = Order.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([order.category.name for order in orders], ['Cargo', 'Truck'])
+
+    def test_invalid_rows_are_rejected(self):
+        path = self.write_csv([
+            ['Valid', '839913324234', 'Valid', 'Sigma', 'Arasaka', future_deadline(), 'Truck'],
+            ['Phone', 'invalid phone', 'Phone', 'Sigma', 'Arasaka', future_deadline(), 'Truck'],
+            ['Past', '839913324234', 'Past', 'Sigma', 'Arasaka', '2010-02-03', 'Truck'],
+            ['Bad date', '839913324234', 'Bad date', 'Sigma', 'Arasaka', '2030-02-30', 'Truck'],
+            ['Missing', '839913324234', '', 'Sigma', 'Arasaka', future_deadline(), 'Truck'],
+        ])
+
+        call_command('import_orders', path, user=self.user.email, stdout=open(os.devnull, 'w'))
+
+        self.assertEqual(list(Order.objects.values_list('contact_name', flat=True)), ['Valid'])
+        rejects = self.read_rejects(path)
+        self.assertEqual(
+            [(row['line'], row['reason']) for row in rejects],
+            [
+                ('3', 'invalid phone'),
+                ('4', 'deadline in the past'),
+                ('5', 'invalid deadline'),
+                ('6', 'missing required field'),
+            ]
+        )
+
+    def test_rejects_report_file_lines(self):
+        valid = {
+            'contact_name': 'Valid', 'contact_phone': '839913324234', 'description': 'Valid',
+            'real_state_agency': 'Sigma', 'company': 'Arasaka', 'deadline': future_deadline(), 'category': 'Truck',
+        }
+        path = self.write_file('orders.ndjson', '\n'.join([
+            json.dumps(valid),
+            '',
+            json.dumps(dict(valid, contact_phone='invalid phone')),
+        ]) + '\n')
+
+        call_command('import_orders', path, user=self.user.email, stdout=open(os.devnull, 'w'))
+
+        self.assertEqual([(row['line'], row['reason']) for row in self.read_rejects(path)], [('3', 'invalid phone')])
+
+    def test_csv_rejects_count_multiline_records(self):
+        path = self.write_csv([
+            ['Valid', '839913324234', 'Spans\ntwo lines', 'Sigma', 'Arasaka', future_deadline(), 'Truck'],
+            ['Phone', 'invalid phone', 'Phone', 'Sigma', 'Arasaka', future_deadline(), 'Truck'],
+        ])
+
+        call_command('import_orders', path, user=self.user.email, stdout=open(os.devnull, 'w'))
+
+        self.assertEqual([(row['line'], row['reason']) for row in self.read_rejects(path)], [('4', 'invalid phone')])
+
+    def test_unknown_user_raises_error(self):
+        path = self.write_csv([])
+
+        with self.assertRaises(CommandError):
+            call_command('import_orders', path, user='missing@example.com')
+
+    def test_missing_columns_raise_error(self):
+        path = self.write_csv([], header=['contact_name'])
+
+        with self.assertRaises(CommandError):
+            call_command('import_orders', path, user=self.user.email)
+
+    def test_invalid_json_raises_error(self):
+        path = self.write_file('orders.ndjson', '{"contact_name": \n')
+
+        with self.assertRaisesMessage(CommandError, 'Line 1 is not valid JSON'):
+            call_command('import_orders', path, user=self.user.email)
+
+    def test_json_that_is_not_an_object_raises_error(self):
+        path = self.write_file('orders.ndjson', '\n[1, 2]\n')
+
+        with self.assertRaisesMessage(CommandError, 'Line 2 is not a JSON object'):
+            call_command('import_orders', path, user=self.user.email)
@@ -0,0 +1,198 @@
+import io
+import threading
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core import jobs
+from core.models import Job
+
+processed = []
+processed_lock = threading.Lock()
+
+
+@jobs.task('test.record')
+def record(value):
+    with processed_lock:
+        processed.append(value)
+
+
+@jobs.task('test.fail')
+def always_fail():
+    raise ValueError('boom')
+
+
+def run_workers(stderr=None, **options):
+    output = io.StringIO()
+    call_command('run_workers', burst=True, stdout=output, stderr=stderr or io.StringIO(), **options)
+    return output.getvalue()
+
+
+@override_settings(JOB_RETRY_BACKOFF=10)
+class JobQueueTests(TransactionTestCase):
+    def setUp(self):
+        processed.clear()
+
+    def test_runs_queued_job(self):
+        job = jobs.enqueue('test.record', {'value': 1})
+
+        output = run_workers(workers=1)
+
+        job.refresh_from_db()
+        self.assertEqual(processed, [1])
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+        self.assertIn('1 jobs done, 0 failed', output)
+
+    def test_every_job_runs_once_across_workers(self):
+        jobs.enqueue_many('test.record', [{'value': value} for value in range(200)])
+
+        run_workers(workers=4, batch_size=5)
+
+        self.assertEqual(sorted(processed), list(range(200)))
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 200)
+
+    def test_delayed_job_waits(self):
+        jobs.enqueue('test.record', {'value': 1}, delay=60)
+
+        run_workers(workers=1)
+
+        self.assertEqual(processed, [])
+        self.assertEqual(Job.objects.get().status, Job.QUEUED)
+
+    def test_failure_is_retried_with_backoff(self):
+        job = jobs.enqueue('test.fail')
+
+        output = run_workers(workers=1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('ValueError: boom', job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+        self.assertIn('0 jobs done, 1 failed', output)
+
+    def test_last_attempt_marks_failed(self):
+        job = jobs.enqueue('test.fail', max_attempts=1)
+
+        run_workers(workers=1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_unknown_task_fails(self):
+        job = jobs.enqueue('test.missing', max_attempts=1)
+
+        run_workers(workers=1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('KeyError', job.last_error)
+
+    def test_claims_skip_locked_jobs(self):
+        jobs.enqueue_many('test.record', [{'value': value} for value in range(4)])
+        claimed = {}
+
+        def claim_elsewhere():
+            try:
+                claimed['other'] = jobs.claim('other', ['default'], 4)
+            finally:
+                connections.close_all()
+
+        with transaction.atomic():
+            claimed['first'] = jobs.claim('first', ['default'], 2)
+            # The first claim's row locks are held until this block commits
+            thread = threading.Thread(target=claim_elsewhere)
+            thread.start()
+            thread.join(timeout=10)
+
+        self.assertEqual(len(claimed['first']), 2)
+        self.assertEqual(len(claimed['other']), 2)
+        self.assertFalse({job[0] for job in claimed['first']} & {job[0] for job in claimed['other']})
+
+    @override_settings(JOB_LOCK_TIMEOUT=60)
+    def test_requeues_jobs_of_dead_workers(self):
+        job = jobs.enqueue('test.record', {'value': 1})
+        Job.objects.filter(pk=job.pk).update(status=Job.RUNNING, locked_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertEqual(jobs.requeue_stale(), (1, 0))
+        run_workers(workers=1)
+
+        self.assertEqual(processed, [1])
+
+    @override_settings(JOB_LOCK_TIMEOUT=60)
+    def test_stale_job_on_last_attempt_fails(self):
+        job = jobs.enqueue('test.record', {'value': 1}, max_attempts=2)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING, attempts=2, locked_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        self.assertEqual(jobs.requeue_stale(), (0, 1))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    @patch('core.management.commands.run_workers.RECONNECT_DELAY', 0)
+    def test_worker_survives_database_errors(self):
+        jobs.enqueue('test.record', {'value': 1})
+        stderr = io.StringIO()
+        work_batch = jobs.work_batch
+        calls = []
+
+        def flaky_work_batch(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise OperationalError('connection lost')
+            return work_batch(*args)
+
+        with patch('core.jobs.work_batch', flaky_work_batch):
+            output = run_workers(workers=1, stderr=stderr)
+
+        self.assertEqual(processed, [1])
+        self.assertIn('1 jobs done, 0 failed', output)
+        self.assertIn('connection lost', stderr.getvalue())
+
+    def test_retry_delay_is_capped(self):
+        with override_settings(JOB_RETRY_BACKOFF=5, JOB_RETRY_BACKOFF_MAX=60):
+            self.assertEqual([jobs.retry_delay(attempt) for attempt in range(1, 6)], [5, 10, 20, 40, 60])
+
+
+class OrderChangeJobTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='tests123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.payload = {
+            'contact_name': 'Contact',
+            'contact_phone': '+5583991382914',
+            'real_state_agency': 'Agency',
+            'company': 'Company',
+            'deadline': (date.today() + timedelta(days=30)).isoformat(),
+            'category': {'name': 'Delivery'},
+            'description': 'Description',
+        }
+
+    def test_no_jobs_by_default(self):
+        self.client.post(reverse('order:order-list'), self.payload, format='json')
+
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(ORDER_CHANGE_JOBS=True)
+    def test_order_writes_enqueue_jobs(self):
+        order_id = self.client.post(reverse('order:order-list'), self.payload, format='json').data['id']
+        self.client.patch(reverse('order:order-detail', args=[order_id]), {'company': 'Other'}, format='json')
+
+        self.assertEqual(
+            list(Job.objects.order_by('id').values_list('name', 'payload')),
+            [
+                ('order.changed', {'order_id': order_id, 'event': 'created'}),
+                ('order.changed', {'order_id': order_id, 'event': 'updated'}),
+            ],
+        )
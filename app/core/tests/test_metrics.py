@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import tempfile
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+ME_URL = reverse('user:me')
+METRICS_URL = reverse('metrics')
+
+WORKER_SCRIPT = '''
+import django
+django.setup()
+from core import metrics
+metrics.REQUESTS.labels('user:me', 'GET', 200).inc()
+metrics.LATENCY.labels('user:me', 'GET').observe(0.02)
+'''
+
+SCRAPE_SCRIPT = '''
+import django
+django.setup()
+from core import metrics
+print(metrics.render()[0].decode())
+'''
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='user@example.com', password='tests123')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_records_route_metrics(self):
+        requests = self.sample('http_requests_total', route='user:me', method='GET', status='200')
+        latencies = self.sample('http_request_duration_seconds_count', route='user:me', method='GET')
+        queries = self.sample('http_request_db_queries_count', route='user:me')
+
+        self.client.get(ME_URL)
+
+        self.assertEqual(self.sample('http_requests_total', route='user:me', method='GET', status='200'), requests + 1)
+        self.assertEqual(self.sample('http_request_duration_seconds_count', route='user:me', method='GET'), latencies + 1)
+        self.assertEqual(self.sample('http_request_db_queries_count', route='user:me'), queries + 1)
+        self.assertGreater(self.sample('http_response_size_bytes_sum', route='user:me'), 0)
+
+    def test_unmatched_routes_share_a_label(self):
+        before = self.sample('http_requests_total', route='unmatched', method='GET', status='404')
+
+        self.client.get('/missing/')
+
+        self.assertEqual(self.sample('http_requests_total', route='unmatched', method='GET', status='404'), before + 1)
+
+    def test_endpoint_exposes_text_format(self):
+        self.client.get(ME_URL)
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'http_requests_total{method="GET",route="user:me",status="200"}', response.content)
+        self.assertIn(b'auth_token_cache{stat="entries"}', response.content)
+
+
+class MultiprocessMetricsTests(SimpleTestCase):
+    def run_python(self, script, directory):
+        env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory, 'DJANGO_SETTINGS_MODULE': 'app.settings'}
+        return subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout
+
+    def test_scrape_sums_worker_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(3):
+                self.run_python(WORKER_SCRIPT, directory)
+
+            output = self.run_python(SCRAPE_SCRIPT, directory)
+
+        self.assertIn('http_requests_total{method="GET",route="user:me",status="200"} 3.0', output)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="user:me"} 3.0', output)
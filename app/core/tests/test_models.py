@@ -1,6 +1,7 @@
 from datetime import date
 from django.test import TestCase
 from core import models
+from core.queries import count_queries
 from django.contrib.auth import get_user_model
 
 def create_category(**params):
@@ -71,4 +72,26 @@ class ModelTests(TestCase):
 
     def test_create_category(self):
         category = models.Category.objects.create(name='Test Category')
-        self.assertEqual(str(category), category.name)
\ No newline at end of file
+        self.assertEqual(str(category), category.name)
+
+    def test_order_update_leaves_search_vector_to_trigger(self):
+        user = get_user_model().objects.create_user('test@example.com', 'testpass123')
+        order = models.Order.objects.create(
+            user=user,
+            contact_name='Contact Name',
+            contact_phone='839913829147',
+            description='Test description',
+            real_state_agency='Test real state agency',
+            company='Sato Company',
+            deadline=date(2025, 1, 1),
+            category=models.Category.objects.create(name='Test Category'),
+        )
+
+        order = models.Order.objects.get(pk=order.pk)
+        order.company = 'Arasaka'
+        with count_queries(record_sql=True) as counter:
+            order.save()
+
+        self.assertEqual(counter.count, 1)
+        self.assertNotIn('search_vector', counter.statements[0])
+        self.assertTrue(models.Order.objects.filter(pk=order.pk, search_vector='arasaka').exists())
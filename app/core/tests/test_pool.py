@@ -0,0 +1,146 @@
+import threading
+from django.db import connection
+from django.test import SimpleTestCase
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+from core.backends.pool import ConnectionPool, PoolTimeout
+from core.backends.postgresql.base import DatabaseWrapper, close_pools, pool_stats
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.status = TRANSACTION_STATUS_IDLE
+        self.rolled_back = False
+
+    def close(self):
+        self.closed = True
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rolled_back = True
+        self.status = TRANSACTION_STATUS_IDLE
+
+
+def create_pool(**params):
+    defaults = {
+        'connect': FakeConnection,
+        'max_size': 2,
+        'max_overflow': 1,
+        'timeout': 0.05,
+        'recycle': 3600,
+        'pre_ping': 3600,
+    }
+    defaults.update(params)
+
+    return ConnectionPool(**defaults)
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_released_connection_is_reused(self):
+        pool = create_pool()
+        first = pool.acquire()
+        pool.release(first)
+
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_overflow_connections_are_closed_on_release(self):
+        pool = create_pool()
+        connections = [pool.acquire() for _ in range(3)]
+
+        self.assertEqual(pool.stats()['overflow'], 1)
+        for pooled in connections:
+            pool.release(pooled)
+
+        self.assertEqual(pool.stats()['size'], 2)
+        self.assertEqual(pool.stats()['idle'], 2)
+        self.assertTrue(connections[-1].closed)
+
+    def test_exhausted_pool_times_out(self):
+        pool = create_pool()
+        for _ in range(3):
+            pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_waiting_acquire_gets_released_connection(self):
+        pool = create_pool(max_size=1, max_overflow=0, timeout=5)
+        first = pool.acquire()
+        timer = threading.Timer(0.05, pool.release, args=[first])
+        timer.start()
+
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(pool.stats()['waits'], 1)
+        timer.join()
+
+    def test_open_transaction_is_rolled_back(self):
+        pool = create_pool()
+        pooled = pool.acquire()
+        pooled.status = TRANSACTION_STATUS_INTRANS
+
+        pool.release(pooled)
+
+        self.assertTrue(pooled.rolled_back)
+
+    def test_closed_connection_is_replaced(self):
+        pool = create_pool()
+        first = pool.acquire()
+        pool.release(first)
+        first.closed = True
+
+        second = pool.acquire()
+
+        self.assertIsNot(second, first)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_failed_connect_frees_slot(self):
+        def connect():
+            raise OperationalError('unreachable')
+
+        pool = create_pool(connect=connect)
+
+        with self.assertRaises(OperationalError):
+            pool.acquire()
+
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+class PooledDatabaseWrapperTests(SimpleTestCase):
+    def create_wrapper(self, **pool):
+        settings_dict = {**connection.settings_dict, 'POOL': {'ENABLED': True, **pool}}
+        wrapper = DatabaseWrapper(settings_dict, alias='pool-test')
+        self.addCleanup(close_pools)
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_connections_are_returned_to_pool(self):
+        wrapper = self.create_wrapper()
+        wrapper.ensure_connection()
+        raw_connection = wrapper.connection
+        wrapper.close()
+
+        wrapper.ensure_connection()
+
+        self.assertIs(wrapper.connection, raw_connection)
+        self.assertEqual(pool_stats()['pool-test']['in_use'], 1)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            self.assertEqual(cursor.fetchone(), (1,))
+
+    def test_persistent_connection_is_health_checked(self):
+        settings_dict = {**connection.settings_dict, 'CONN_MAX_AGE': 60}
+        wrapper = DatabaseWrapper(settings_dict, alias='persistent-test')
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        wrapper.connection.close()
+
+        wrapper.close_if_unusable_or_obsolete()
+        wrapper.ensure_connection()
+
+        self.assertFalse(wrapper.connection.closed)
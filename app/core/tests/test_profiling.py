@@ -0,0 +1,117 @@
+import asyncio
+import io
+import os
+import pstats
+import tempfile
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core.middleware import ProfilingMiddleware
+from core.profiling import CPROFILE, TIMING, sign_mode
+
+ME_URL = reverse('user:me')
+ORDERS_URL = reverse('order:order-list')
+
+
+def timing_names(response):
+    return [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='tests123')
+        self.staff = get_user_model().objects.create_user(email='staff@example.com', password='tests123', is_staff=True)
+        self.client = APIClient()
+        # Async tests cannot reach the database to create one
+        self.token = Token.objects.create(user=self.user)
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=user)[0].key}')
+
+    def test_no_header_no_timing(self):
+        self.authenticate(self.staff)
+
+        response = self.client.get(ORDERS_URL)
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_staff_gets_timing_breakdown(self):
+        self.authenticate(self.staff)
+
+        response = self.client.get(ORDERS_URL, HTTP_X_PROFILE=TIMING)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(timing_names(response), ['auth', 'db', 'serialize', 'render', 'total'])
+        # Token lookup, then the usual order list queries
+        self.assertIn('desc="4 queries"', response['Server-Timing'])
+
+    def test_async_chain_hooks_need_no_thread(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = ProfilingMiddleware(get_response)
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        self.assertTrue(asyncio.iscoroutinefunction(middleware.process_view))
+        self.assertTrue(asyncio.iscoroutinefunction(middleware.process_template_response))
+        self.assertFalse(asyncio.iscoroutinefunction(ProfilingMiddleware(lambda request: None).process_view))
+
+    async def test_async_request_gets_timing_breakdown(self):
+        response = await self.async_client.get(
+            ME_URL, authorization=f'Token {self.token.key}', x_profile=sign_mode(TIMING),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(timing_names(response), ['auth', 'db', 'serialize', 'render', 'total'])
+        self.assertNotIn('serialize;dur=0.00', response['Server-Timing'])
+
+    def test_unsigned_header_ignored_for_regular_users(self):
+        self.authenticate(self.user)
+
+        response = self.client.get(ME_URL, HTTP_X_PROFILE=TIMING)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+
+    def test_signed_header_enables_timing_for_anyone(self):
+        self.authenticate(self.user)
+
+        response = self.client.get(ME_URL, HTTP_X_PROFILE=sign_mode(TIMING))
+
+        self.assertIn('Server-Timing', response)
+
+    def test_tampered_signature_is_ignored(self):
+        self.authenticate(self.user)
+
+        response = self.client.get(ME_URL, HTTP_X_PROFILE=sign_mode(TIMING)[:-1] + 'x')
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_signed_cprofile_writes_dump(self):
+        self.authenticate(self.user)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(PROFILING_DIR=directory):
+            response = self.client.get(ORDERS_URL, HTTP_X_PROFILE=sign_mode(CPROFILE))
+            dump = os.path.join(directory, response['X-Profile-Dump'])
+
+            self.assertTrue(pstats.Stats(dump).total_calls > 0)
+        self.assertIn('Server-Timing', response)
+
+    def test_cprofile_without_directory_only_times(self):
+        self.authenticate(self.user)
+
+        response = self.client.get(ORDERS_URL, HTTP_X_PROFILE=sign_mode(CPROFILE))
+
+        self.assertIn('Server-Timing', response)
+        self.assertNotIn('X-Profile-Dump', response)
+
+    def test_profile_header_command(self):
+        output = io.StringIO()
+
+        call_command('profile_header', mode=CPROFILE, stdout=output, stderr=io.StringIO())
+
+        self.assertTrue(output.getvalue().startswith('X-Profile: cprofile:'))
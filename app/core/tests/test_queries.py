@@ -0,0 +1,88 @@
+import contextvars
+import threading
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.models import Category
+from core.queries import count_queries
+from core.testing import QueryBudgetMixin, query_budget
+
+ME_URL = reverse('user:me')
+
+
+class QueryCounterTests(TestCase):
+    def test_counts_executed_queries(self):
+        with count_queries(record_sql=True) as counter:
+            list(Category.objects.all())
+            Category.objects.count()
+
+        self.assertEqual(counter.count, 2)
+        self.assertEqual(len(counter.statements), 2)
+        self.assertGreater(counter.duration, 0)
+
+    def test_counts_queries_of_threads_sharing_the_context(self):
+        def count_elsewhere():
+            try:
+                Category.objects.count()
+            finally:
+                connections.close_all()
+
+        with count_queries() as counter:
+            thread = threading.Thread(target=contextvars.copy_context().run, args=(count_elsewhere,))
+            thread.start()
+            thread.join(timeout=10)
+
+        self.assertEqual(counter.count, 1)
+
+    def test_middleware_exposes_query_count(self):
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123'
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get(ME_URL)
+
+        self.assertEqual(response['X-DB-Query-Count'], '0')
+        self.assertIn('X-DB-Query-Time', response)
+
+
+class QueryBudgetMixinTests(QueryBudgetMixin, TestCase):
+    def test_constant_queries_fails_on_growth(self):
+        def grow(count):
+            for _ in range(count):
+                Category.objects.create(name='Delivery')
+
+        def request():
+            for category in Category.objects.all():
+                Category.objects.get(id=category.id)
+
+        with self.assertRaises(AssertionError):
+            self.assertConstantQueries(request, grow)
+
+    def test_max_queries_fails_over_budget(self):
+        with self.assertRaises(AssertionError):
+            with self.assertMaxQueries(1):
+                Category.objects.count()
+                Category.objects.count()
+
+
+class QueryBudgetDecoratorTests(TestCase):
+    def test_within_budget_returns_result(self):
+        @query_budget(1)
+        def count_categories(test):
+            return Category.objects.count()
+
+        self.assertEqual(count_categories(self), 0)
+
+    def test_over_budget_fails_with_statements(self):
+        @query_budget(1)
+        def count_twice(test):
+            Category.objects.count()
+            Category.objects.count()
+
+        with self.assertRaisesMessage(AssertionError, '2 queries executed, budget is 1'):
+            count_twice(self)
@@ -0,0 +1,71 @@
+import io
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core.management.commands.benchmark_json import build_payload
+from core.renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertRendersLikeStandard(self, data, accepted_media_type='application/json'):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_order_payload_matches_standard_renderer(self):
+        self.assertRendersLikeStandard(build_payload(20))
+
+    def test_special_values_match_standard_renderer(self):
+        self.assertRendersLikeStandard({
+            'datetime': datetime(2030, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            'date': date(2030, 1, 1),
+            'decimal': Decimal('10.25'),
+            'uuid': UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('This field is required.'),
+            'separators': 'line paragraph ',
+            1: 'non string key',
+        })
+
+    def test_indented_output_matches_standard_renderer(self):
+        self.assertRendersLikeStandard({'id': 1, 'name': 'Cargo'}, 'application/json; indent=4')
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_parses_like_standard_parser(self):
+        content = JSONRenderer().render(build_payload(20))
+
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(content)),
+            JSONParser().parse(io.BytesIO(content)),
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+    def test_non_utf8_encoding_falls_back(self):
+        content = '{"name": "Caminhão"}'.encode('latin-1')
+
+        data = ORJSONParser().parse(io.BytesIO(content), parser_context={'encoding': 'latin-1'})
+
+        self.assertEqual(data, {'name': 'Caminhão'})
+
+
+class BenchmarkJSONCommandTests(SimpleTestCase):
+    def test_reports_both_backends(self):
+        output = io.StringIO()
+
+        call_command('benchmark_json', sizes=[5], repeat=1, stdout=output)
+
+        self.assertIn('standard', output.getvalue())
+        self.assertIn('orjson', output.getvalue())
@@ -0,0 +1,65 @@
+import io
+import tempfile
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from core import schema
+
+SCHEMA_URL = reverse('api-schema')
+
+
+class CachedSchemaViewTests(SimpleTestCase):
+    def setUp(self):
+        schema.clear()
+        self.addCleanup(schema.clear)
+
+    def test_schema_generated_once(self):
+        with patch('core.schema.generate', wraps=schema.generate) as generate:
+            first = self.client.get(SCHEMA_URL)
+            second = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertIn(b'/api/order/orders/', first.content)
+
+    def test_formats_are_cached_separately(self):
+        yaml = self.client.get(SCHEMA_URL)
+        json = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        self.assertEqual(yaml['Content-Type'], 'application/vnd.oai.openapi; charset=utf-8')
+        self.assertEqual(json['Content-Type'], 'application/vnd.oai.openapi+json')
+        self.assertTrue(json.content.startswith(b'{'))
+        self.assertNotEqual(yaml['ETag'], json['ETag'])
+
+    def test_languages_share_cache_keys(self):
+        with patch('core.schema.generate', wraps=schema.generate) as generate:
+            for lang in ('en', 'en-us', 'xx', 'no-such-language', 'DE', 'de-de'):
+                self.client.get(SCHEMA_URL, {'lang': lang})
+
+        self.assertEqual(set(schema.schemas), {('yaml', None), ('yaml', 'de')})
+        self.assertEqual(generate.call_count, 2)
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(SCHEMA_URL)['ETag']
+
+        response = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_serves_prebuilt_schema(self):
+        lazy = {format: self.client.get(SCHEMA_URL, {'format': format}).content for format in ('yaml', 'json')}
+        schema.clear()
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(OPENAPI_SCHEMA_DIR=directory):
+            call_command('build_schema', stdout=io.StringIO())
+            with patch('core.schema.generate') as generate:
+                prebuilt = {
+                    format: self.client.get(SCHEMA_URL, {'format': format}).content for format in ('yaml', 'json')
+                }
+
+        generate.assert_not_called()
+        self.assertEqual(prebuilt, lazy)
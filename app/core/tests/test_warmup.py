@@ -0,0 +1,97 @@
+import io
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from app import gunicorn_conf
+from core import schema, warmup
+
+
+class WarmUpTests(SimpleTestCase):
+    def setUp(self):
+        schema.clear()
+        self.addCleanup(schema.clear)
+
+    def test_warm_up_fills_caches(self):
+        timings = warmup.warm_up()
+
+        self.assertEqual(set(timings), {'urls', 'serializers', 'schema'})
+        self.assertEqual(set(schema.schemas), {('yaml', None), ('json', None)})
+
+    def test_finds_project_serializers(self):
+        warmup.resolve_urls()
+
+        names = {serializer.__name__ for serializer in warmup.project_serializers()}
+
+        self.assertTrue({'OrderSerializer', 'OrderDetailSerializer', 'CategorySerializer', 'UserSerializer'} <= names)
+
+
+@patch('core.warmup.freeze_heap')
+@patch('core.warmup.warm_up', return_value={})
+class GunicornConfTests(SimpleTestCase):
+    def server(self, workers):
+        return SimpleNamespace(cfg=SimpleNamespace(workers=workers))
+
+    def test_refuses_several_workers_on_process_local_cache(self, warm_up, freeze_heap):
+        with self.assertRaisesMessage(RuntimeError, 'shared'):
+            gunicorn_conf.when_ready(self.server(workers=4))
+
+        warm_up.assert_not_called()
+
+    def test_single_worker_may_use_process_local_cache(self, warm_up, freeze_heap):
+        gunicorn_conf.when_ready(self.server(workers=1))
+
+        warm_up.assert_called_once()
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}})
+    @patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': '/tmp/metrics'})
+    def test_shared_cache_allows_several_workers(self, warm_up, freeze_heap):
+        gunicorn_conf.when_ready(self.server(workers=4))
+
+        warm_up.assert_called_once()
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}})
+    def test_refuses_several_workers_without_multiprocess_metrics(self, warm_up, freeze_heap):
+        environ = {key: value for key, value in os.environ.items() if key != 'PROMETHEUS_MULTIPROC_DIR'}
+        with patch.dict(os.environ, environ, clear=True):
+            with self.assertRaisesMessage(RuntimeError, 'PROMETHEUS_MULTIPROC_DIR'):
+                gunicorn_conf.when_ready(self.server(workers=4))
+
+            gunicorn_conf.when_ready(self.server(workers=1))
+
+        warm_up.assert_called_once()
+
+
+class ConnectTests(SimpleTestCase):
+    databases = '__all__'
+
+    def test_skipped_without_reusable_connections(self):
+        for mode, threads in (('none', 1), ('persistent', 4)):
+            with self.subTest(mode=mode, threads=threads), override_settings(DB_POOL_MODE=mode):
+                with patch('django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection') as ensure:
+                    self.assertFalse(warmup.connect(threads=threads))
+
+                ensure.assert_not_called()
+
+    @override_settings(DB_POOL_MODE='persistent')
+    def test_opens_persistent_connection_for_this_thread(self):
+        self.assertTrue(warmup.connect(threads=1))
+
+
+class StartupReportCommandTests(TransactionTestCase):
+    def test_reports_cold_and_warm_processes(self):
+        output = io.StringIO()
+
+        call_command('startup_report', runs=1, stdout=output)
+
+        report = json.loads(output.getvalue())
+        warmed = {'urls', 'serializers', 'schema'} | ({'connect'} if settings.DB_POOL_MODE != 'none' else set())
+        self.assertEqual(report['cold']['warmup_ms'], {})
+        self.assertEqual(set(report['warm']['warmup_ms']), warmed)
+        self.assertEqual(report['db_pool_mode'], settings.DB_POOL_MODE)
+        self.assertEqual(set(report['warm']['first_request_ms']), {'schema', 'category_list', 'user_me', 'order_list'})
+        self.assertFalse(get_user_model().objects.exists())
@@ -1,4 +1,5 @@
 from django.core.validators import RegexValidator
+from django.db.models import F, Func, Value
 from django.forms import ValidationError
 import datetime
 
@@ -7,6 +8,9 @@ phone_regex = RegexValidator(
     message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
 )
 
+def normalized_phone(field='contact_phone'):
+    return Func(F(field), Value('[^0-9]'), Value(''), Value('g'), function='regexp_replace')
+
 def validate_deadline(date):
     if date < datetime.date.today():
         raise ValidationError('Date cannot be set to a previous date')
\ No newline at end of file
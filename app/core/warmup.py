@@ -0,0 +1,99 @@
+import gc
+import time
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework import serializers
+from core import schema
+
+
+def walk_patterns(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from walk_patterns(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def subclasses(base):
+    for subclass in base.__subclasses__():
+        yield subclass
+        yield from subclasses(subclass)
+
+
+def project_serializers():
+    local_apps = {config.name for config in apps.get_app_configs() if config.path.startswith(str(settings.BASE_DIR))}
+    return {
+        serializer for serializer in subclasses(serializers.Serializer)
+        if serializer.__module__.split('.')[0] in local_apps
+    }
+
+
+def resolve_urls():
+    # Populates the resolver's reverse lookup tables and compiles every
+    # pattern's regex
+    resolver = get_resolver()
+    patterns = list(walk_patterns(resolver.url_patterns))
+    for pattern in patterns:
+        pattern.pattern.regex
+    resolver.reverse_dict
+    return len(patterns)
+
+
+def build_serializer_fields():
+    # Model metadata caches, field validators and lazy translations are
+    # shared by every later instance
+    built = 0
+    for serializer_class in project_serializers():
+        serializer_class().fields
+        built += 1
+    return built
+
+
+def connect(threads=1):
+    """
+    Open the connections of the first requests and return whether it did.
+    Only pooled connections, or persistent ones used by this same thread,
+    outlive the request_started cleanup; anything else would be wasted.
+    """
+    if settings.DB_POOL_MODE == 'none' or (settings.DB_POOL_MODE == 'persistent' and threads > 1):
+        return False
+
+    for connection in connections.all():
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    if settings.DB_POOL_MODE == 'pool':
+        # Back in the pool, whichever thread serves the first request takes it
+        connections.close_all()
+
+    return True
+
+
+def warm_up():
+    """
+    Pay the one-off costs of a cold process before it serves traffic,
+    returning the milliseconds each step took. Opens no database connection,
+    so it is safe to run before forking workers.
+    """
+    steps = {
+        'urls': resolve_urls,
+        'serializers': build_serializer_fields,
+        'schema': schema.warm,
+    }
+    timings = {}
+    for name, step in steps.items():
+        start = time.perf_counter()
+        step()
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    return timings
+
+
+def freeze_heap():
+    # Objects allocated so far move to the permanent generation, so the
+    # collector in forked workers never touches, and copies, their pages
+    gc.collect()
+    gc.freeze()
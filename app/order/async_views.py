@@ -0,0 +1,99 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from core.models import Order
+from order.pagination import KeysetPagination
+from order.projection import project_orders, represent_orders
+from order.serializers import OrderDetailSerializer, OrderSerializer
+from order.stats import order_count
+from user.authentication import CachedTokenAuthentication
+
+executor = ThreadPoolExecutor(max_workers=settings.ASYNC_DB_WORKERS, thread_name_prefix='async-db')
+renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+
+
+def call_with_connection(function, *args):
+    close_old_connections()
+    try:
+        return function(*args)
+    finally:
+        close_old_connections()
+
+
+async def run_in_db_thread(function, *args):
+    loop = asyncio.get_running_loop()
+    # run_in_executor does not carry the context over, the request's query
+    # counters and Server-Timing live in it
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, partial(context.run, call_with_connection, function, *args))
+
+
+def render(data, status=200, **headers):
+    response = HttpResponse(renderer.render(data), content_type='application/json', status=status)
+    for header, value in headers.items():
+        response[header] = value
+
+    return response
+
+
+def authenticate(request):
+    authentication = CachedTokenAuthentication()
+    credentials = authentication.authenticate(Request(request))
+    if credentials is None:
+        raise exceptions.NotAuthenticated()
+
+    return credentials[0]
+
+
+def list_orders(request):
+    user = authenticate(request)
+    drf_request = Request(request)
+    paginator = KeysetPagination()
+    # No filters here, the maintained total is always the listing's count
+    paginator.count = order_count(user)
+    queryset = Order.objects.filter(user=user).defer('search_vector')
+    if settings.ORDER_LIST_PROJECTION:
+        page = paginator.paginate_queryset(project_orders(queryset), drf_request)
+        return paginator.get_paginated_response(represent_orders(page)).data
+
+    page = paginator.paginate_queryset(queryset.select_related('category'), drf_request)
+    return paginator.get_paginated_response(OrderSerializer(page, many=True).data).data
+
+
+def retrieve_order(request, pk):
+    user = authenticate(request)
+    try:
+        order = Order.objects.select_related('category').defer('search_vector').get(user=user, pk=pk)
+    except Order.DoesNotExist:
+        raise exceptions.NotFound()
+
+    return OrderDetailSerializer(order).data
+
+
+async def respond(request, function, *args):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    try:
+        return render(await run_in_db_thread(function, request, *args))
+    except exceptions.APIException as exc:
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            headers['WWW-Authenticate'] = CachedTokenAuthentication.keyword
+        return render(data, status=exc.status_code, **headers)
+
+
+async def order_list(request):
+    return await respond(request, list_orders)
+
+
+async def order_detail(request, pk):
+    return await respond(request, retrieve_order, pk)
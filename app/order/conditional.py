@@ -0,0 +1,45 @@
+import hashlib
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from category.cache import get_version
+
+
+def make_etag(request, *parts):
+    # Category names are embedded in every order, so renaming one must change
+    # the validator of the orders pointing at it
+    parts = (request.accepted_renderer.format, get_version()) + parts
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def list_validators(request, queryset, count):
+    # The order count catches deletions, which leave the newest updated_at alone
+    last_modified = queryset.order_by().aggregate(last_modified=Max('updated_at'))['last_modified']
+    etag = make_etag(request, request.user.pk, count, last_modified)
+    return etag, last_modified
+
+
+def object_validators(request, order):
+    return make_etag(request, order.pk, order.updated_at), order.updated_at
+
+
+def conditional_response(request, etag, last_modified, use_last_modified=True):
+    """
+    Return a 304 response when the request validators match, ``None`` when
+    the view should render a full response.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified and use_last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+
+    return response
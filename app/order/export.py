@@ -0,0 +1,82 @@
+import csv
+import json
+from django.conf import settings
+
+COLUMNS = [
+    'id',
+    'contact_name',
+    'contact_phone',
+    'real_state_agency',
+    'company',
+    'deadline',
+    'category_id',
+    'category__name',
+    'description',
+]
+
+CSV_HEADER = [
+    'id',
+    'contact_name',
+    'contact_phone',
+    'real_state_agency',
+    'company',
+    'deadline',
+    'category_id',
+    'category_name',
+    'description',
+]
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset):
+    rows = queryset.order_by('id').values_list(*COLUMNS)
+    return rows.iterator(chunk_size=settings.ORDER_EXPORT_CHUNK_SIZE)
+
+
+def iter_chunks(lines):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == settings.ORDER_EXPORT_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+
+    if chunk:
+        yield ''.join(chunk)
+
+
+def iter_ndjson(queryset):
+    for (order_id, contact_name, contact_phone, real_state_agency,
+         company, deadline, category_id, category_name, description) in iter_rows(queryset):
+        yield json.dumps({
+            'id': order_id,
+            'contact_name': contact_name,
+            'contact_phone': contact_phone,
+            'real_state_agency': real_state_agency,
+            'company': company,
+            'deadline': deadline.isoformat(),
+            'category': {'id': category_id, 'name': category_name},
+            'description': description,
+        }, ensure_ascii=False) + '\n'
+
+
+def iter_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for row in iter_rows(queryset):
+        yield writer.writerow(row)
+
+
+FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
+
+
+def export_orders(queryset, export_format):
+    serialize, content_type = FORMATS[export_format]
+    return iter_chunks(serialize(queryset)), content_type
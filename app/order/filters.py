@@ -0,0 +1,113 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from core.models import Category
+from core.util import normalized_phone
+
+# Must match the configuration used by the core_order_search_vector trigger
+SEARCH_CONFIG = 'simple'
+
+
+class OrderSearchFilter(BaseFilterBackend):
+    """
+    Full-text search over the stored order search vector, annotating each
+    match with its ``rank`` so the pagination can order by relevance.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+
+        query = SearchQuery(terms, config=SEARCH_CONFIG, search_type='websearch')
+        # ts_rank returns a real, compared against the double precision cursor
+        # value it would never equal it again
+        rank = Cast(SearchRank(F('search_vector'), query), FloatField())
+        return queryset.filter(search_vector=query).annotate(rank=rank)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Words to look for in the contact name, company, agency and description.',
+                'schema': {'type': 'string'},
+            },
+        ]
+
+
+class OrderFilter(BaseFilterBackend):
+    """
+    Exact and range filters on the order list, each one served by an index
+    leading with ``user_id``.
+    """
+    fields = {
+        'deadline_after': serializers.DateField(help_text='Orders due on or after this date.'),
+        'deadline_before': serializers.DateField(help_text='Orders due on or before this date.'),
+        'category': serializers.IntegerField(help_text='Category id.'),
+        'category_name': serializers.CharField(help_text='Category name.'),
+        'company': serializers.CharField(help_text='Exact company name.'),
+        'real_state_agency': serializers.CharField(help_text='Exact real state agency name.'),
+        'phone': serializers.CharField(help_text='Contact phone, compared on its digits only.'),
+    }
+    schemas = {
+        serializers.DateField: {'type': 'string', 'format': 'date'},
+        serializers.IntegerField: {'type': 'integer'},
+        serializers.CharField: {'type': 'string'},
+    }
+
+    def get_params(self, request):
+        params, errors = {}, {}
+        for name, field in self.fields.items():
+            value = request.query_params.get(name)
+            if value is None or value == '':
+                continue
+
+            try:
+                params[name] = field.run_validation(value)
+            except ValidationError as exc:
+                errors[name] = exc.detail
+
+        if errors:
+            raise ValidationError(errors)
+
+        return params
+
+    def filter_queryset(self, request, queryset, view):
+        params = self.get_params(request)
+        if 'deadline_after' in params:
+            queryset = queryset.filter(deadline__gte=params['deadline_after'])
+        if 'deadline_before' in params:
+            queryset = queryset.filter(deadline__lte=params['deadline_before'])
+        if 'category' in params:
+            queryset = queryset.filter(category_id=params['category'])
+        if 'category_name' in params:
+            # A subquery keeps the plan on order_user_category_idx
+            queryset = queryset.filter(category_id__in=Category.objects.filter(name=params['category_name']).values('id'))
+        if 'company' in params:
+            queryset = queryset.filter(company=params['company'])
+        if 'real_state_agency' in params:
+            queryset = queryset.filter(real_state_agency=params['real_state_agency'])
+        if 'phone' in params:
+            # Same expression as order_user_phone_idx
+            queryset = queryset.alias(phone=normalized_phone()).filter(phone=re.sub(r'\D', '', params['phone']))
+
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': name,
+                'required': False,
+                'in': 'query',
+                'description': field.help_text,
+                'schema': self.schemas[type(field)],
+            }
+            for name, field in self.fields.items()
+        ]
@@ -0,0 +1,219 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor pagination that seeks on the sort key instead of using
+    OFFSET, so every page costs the same index range scan.
+
+    Every ordering ends on a unique column, which makes the position of a
+    row total and lets the cursor be a plain tuple of column values.
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    default_ordering = '-id'
+    orderings = {
+        '-id': ('-id',),
+        'id': ('id',),
+        '-deadline': ('-deadline', '-id'),
+        'deadline': ('deadline', 'id'),
+        '-rank': ('-rank', '-id'),
+    }
+    # Orderings on an annotation, only available when the queryset has it
+    ranked_ordering = '-rank'
+    invalid_cursor_message = 'Invalid cursor'
+    # Total of the unfiltered listing, set by views that can tell it cheaply
+    count = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset)
+
+        position, reverse = self.decode_cursor(request, queryset)
+        fields = self.orderings[self.ordering]
+        if reverse:
+            fields = tuple(self._flip(field) for field in fields)
+
+        queryset = queryset.order_by(*fields)
+        if position is not None:
+            queryset = queryset.filter(self._seek(fields, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        page_size = request.query_params.get(self.page_size_query_param)
+        if page_size is None:
+            return self.page_size
+
+        try:
+            page_size = int(page_size)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'A valid integer is required.'})
+
+        if page_size < 1:
+            raise ValidationError({self.page_size_query_param: 'Ensure this value is greater than or equal to 1.'})
+
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset):
+        ranked = 'rank' in queryset.query.annotations
+        orderings = [ordering for ordering in self.orderings if ranked or ordering != self.ranked_ordering]
+        default = self.ranked_ordering if ranked else self.default_ordering
+        ordering = request.query_params.get(self.ordering_query_param, default)
+        if ordering not in orderings:
+            raise ValidationError({
+                self.ordering_query_param: 'Supported values are: %s.' % ', '.join(orderings)
+            })
+
+        return ordering
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor.get('r', False))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        fields = self.orderings[self.ordering]
+        if not isinstance(position, list) or len(position) != len(fields):
+            raise NotFound(self.invalid_cursor_message)
+
+        # Values go straight into the seek filter, a wrong type must not reach the database
+        try:
+            position = [self._to_python(queryset, field.lstrip('-'), value) for field, value in zip(fields, position)]
+        except (DjangoValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, row, reverse):
+        position = [self._value(row, field.lstrip('-')) for field in self.orderings[self.ordering]]
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = True
+
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.ordering_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Sort key of the results, -rank orders searches by relevance and is their default.',
+                'schema': {'type': 'string', 'enum': list(self.orderings)},
+            },
+        ]
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    @staticmethod
+    def _seek(fields, position):
+        # (a, b) after (x, y) expands to: a > x OR (a = x AND b > y)
+        condition = None
+        for field, value in reversed(list(zip(fields, position))):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{'%s__%s' % (name, lookup): value})
+            if condition is not None:
+                step |= Q(**{name: value}) & condition
+            condition = step
+
+        return condition
+
+    @staticmethod
+    def _to_python(queryset, name, value):
+        if value is None:
+            raise ValueError('Cursor values cannot be null')
+
+        annotation = queryset.query.annotations.get(name)
+        field = annotation.output_field if annotation is not None else queryset.model._meta.get_field(name)
+        return field.to_python(value)
+
+    @staticmethod
+    def _value(row, name):
+        value = row[name] if isinstance(row, dict) else getattr(row, name)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+
+        return value
@@ -0,0 +1,35 @@
+COLUMNS = (
+    'id',
+    'contact_name',
+    'contact_phone',
+    'real_state_agency',
+    'company',
+    'deadline',
+    'category_id',
+    'category__name',
+)
+
+
+def project_orders(queryset):
+    """
+    Read-only counterpart of ``OrderSerializer`` for listings: rows are
+    fetched as plain dicts holding only the serialized columns, plus any
+    annotation the pagination may order on.
+    """
+    return queryset.values(*COLUMNS, *queryset.query.annotation_select)
+
+
+def represent_order(row):
+    return {
+        'id': row['id'],
+        'contact_name': row['contact_name'],
+        'contact_phone': row['contact_phone'],
+        'real_state_agency': row['real_state_agency'],
+        'company': row['company'],
+        'deadline': row['deadline'].isoformat(),
+        'category': {'id': row['category_id'], 'name': row['category__name']},
+    }
+
+
+def represent_orders(rows):
+    return [represent_order(row) for row in rows]
@@ -1,7 +1,34 @@
-from core.models import Category
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext as _
+from category.cache import get_categories, get_category
 from category.serializers import CategorySerializer
 from rest_framework import serializers
 from core.models import Order
+from order.tasks import notify_changed
+
+
+class OrderListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list) and len(data) > settings.ORDER_BULK_MAX_ITEMS:
+            msg = _('Ensure this list has no more than {max_items} items.')
+            raise serializers.ValidationError(
+                {'non_field_errors': [msg.format(max_items=settings.ORDER_BULK_MAX_ITEMS)]},
+                code='max_length'
+            )
+
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            categories = get_categories({item['category']['name'] for item in validated_data})
+            orders = [
+                Order(**{**item, 'category': categories[item['category']['name']]})
+                for item in validated_data
+            ]
+            orders = Order.objects.bulk_create(orders, batch_size=settings.ORDER_BULK_BATCH_SIZE)
+            notify_changed(orders, 'created')
+            return orders
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -11,24 +38,28 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = ['id', 'contact_name', 'contact_phone', 'real_state_agency', 'company', 'deadline', 'category']
         read_only_fields = ['id']
+        list_serializer_class = OrderListSerializer
 
     def create(self, validated_data):
         category = validated_data.pop('category', {})
-        category_object = Category.objects.get_or_create(name=category['name'])
-        order = Order.objects.create(**validated_data, category=category_object[0])
+        # The order and its job commit together
+        with transaction.atomic(savepoint=False):
+            order = Order.objects.create(**validated_data, category=get_category(category['name']))
+            notify_changed([order], 'created')
         return order
 
     def update(self, instance, validated_data):
         category = validated_data.pop('category', None)
 
         if category is not None:
-            category_object = Category.objects.get_or_create(name=category['name'])
-            setattr(instance, 'category', category_object[0])
+            setattr(instance, 'category', get_category(category['name']))
 
         for attribute, value in validated_data.items():
             setattr(instance, attribute, value)
 
-        instance.save()
+        with transaction.atomic(savepoint=False):
+            instance.save()
+            notify_changed([instance], 'updated')
         return instance
 
 
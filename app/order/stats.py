@@ -0,0 +1,68 @@
+from django.db import connection, transaction
+from core.models import Category, OrderStat
+
+# Same keys as the core_order_stats trigger
+LIVE_STATS_SQL = '''
+SELECT user_id, 'total' AS dimension, '' AS key, count(*) AS count FROM core_order GROUP BY 1
+UNION ALL
+SELECT user_id, 'category', category_id::text, count(*) FROM core_order GROUP BY 1, 3
+UNION ALL
+SELECT user_id, 'week', to_char(date_trunc('week', deadline), 'YYYY-MM-DD'), count(*) FROM core_order GROUP BY 1, 3
+UNION ALL
+SELECT user_id, 'company', company, count(*) FROM core_order GROUP BY 1, 3
+'''
+
+
+def order_count(user):
+    counts = OrderStat.objects.filter(user=user, dimension=OrderStat.TOTAL, key='').values_list('count', flat=True)
+    return next(iter(counts), 0)
+
+
+def user_stats(user):
+    rows = {dimension: [] for dimension, _ in OrderStat.DIMENSIONS}
+    for stat in OrderStat.objects.filter(user=user).order_by('-count', 'key'):
+        rows[stat.dimension].append(stat)
+
+    categories = Category.objects.in_bulk([int(stat.key) for stat in rows[OrderStat.CATEGORY]])
+    return {
+        'total': sum(stat.count for stat in rows[OrderStat.TOTAL]),
+        'by_category': [
+            {'id': int(stat.key), 'name': categories[int(stat.key)].name, 'count': stat.count}
+            for stat in rows[OrderStat.CATEGORY]
+        ],
+        'by_deadline_week': [
+            {'week': stat.key, 'count': stat.count}
+            for stat in sorted(rows[OrderStat.WEEK], key=lambda stat: stat.key)
+        ],
+        'by_company': [
+            {'company': stat.key, 'count': stat.count}
+            for stat in rows[OrderStat.COMPANY]
+        ],
+    }
+
+
+def find_inconsistencies():
+    """
+    Compare the rollup with the live aggregate, returning
+    ``(user_id, dimension, key, stored, live)`` for every differing count.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'''
+            SELECT coalesce(live.user_id, stored.user_id), coalesce(live.dimension, stored.dimension),
+                   coalesce(live.key, stored.key), coalesce(stored.count, 0), coalesce(live.count, 0)
+            FROM ({LIVE_STATS_SQL}) live
+            FULL OUTER JOIN {OrderStat._meta.db_table} stored
+              ON stored.user_id = live.user_id AND stored.dimension = live.dimension AND stored.key = live.key
+            WHERE stored.count IS DISTINCT FROM live.count
+            ORDER BY 1, 2, 3
+        ''')
+        return cursor.fetchall()
+
+
+def rebuild():
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Blocks order writes, their triggers would race with the rebuild
+        cursor.execute('LOCK TABLE core_order IN SHARE MODE')
+        cursor.execute(f'DELETE FROM {OrderStat._meta.db_table}')
+        cursor.execute(f'INSERT INTO {OrderStat._meta.db_table} (user_id, dimension, key, count) {LIVE_STATS_SQL}')
+        return cursor.rowcount
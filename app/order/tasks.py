@@ -0,0 +1,19 @@
+import logging
+from django.conf import settings
+from core.jobs import enqueue_many, task
+
+logger = logging.getLogger(__name__)
+
+CHANGED = 'order.changed'
+
+
+def notify_changed(orders, event):
+    """Queue an order.changed job per order, when ORDER_CHANGE_JOBS is on."""
+    if settings.ORDER_CHANGE_JOBS:
+        enqueue_many(CHANGED, [{'order_id': order.pk, 'event': event} for order in orders])
+
+
+@task(CHANGED)
+def order_changed(order_id, event):
+    # Notifications and exports hook in here, off the request path
+    logger.info('Order %s %s', order_id, event)
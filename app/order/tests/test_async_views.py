@@ -0,0 +1,122 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from core.models import Category, Order
+from order.serializers import OrderDetailSerializer, OrderSerializer
+
+ASYNC_ORDERS_URL = reverse('order:async-order-list')
+HEALTH_CHECK_URL = reverse('health-check')
+
+
+def detail_url(order_id):
+    return reverse('order:async-order-detail', args=[order_id])
+
+
+def create_order(user, **params):
+    defaults = {
+        'contact_name': 'Contact Name',
+        'contact_phone': '839913829147',
+        'description': 'Test description',
+        'real_state_agency': 'Test real state agency',
+        'company': 'Sato Company',
+        'deadline': date(2025, 1, 1),
+        'category': Category.objects.create(name='Delivery Category'),
+    }
+
+    defaults.update(params)
+
+    return Order.objects.create(user=user, **defaults)
+
+
+class AsyncOrderViewTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='tests123')
+        self.token = Token.objects.create(user=self.user)
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+
+    async def test_auth_required(self):
+        response = await self.async_client.get(ASYNC_ORDERS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+    def test_list_matches_sync_endpoint(self):
+        create_order(self.user)
+
+        response = self.client.get(ASYNC_ORDERS_URL, **self.headers)
+        sync_response = self.client.get(reverse('order:order-list'), **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'], sync_response.json()['results'])
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['count'], sync_response.json()['count'])
+
+    def test_list_orders_limited_to_user(self):
+        orders = [create_order(self.user) for _ in range(3)]
+        other_user = get_user_model().objects.create_user(email='other@example.com', password='tests123')
+        create_order(other_user)
+
+        response = self.client.get(ASYNC_ORDERS_URL, **self.headers)
+
+        expected = OrderSerializer(sorted(orders, key=lambda order: -order.id), many=True).data
+        self.assertEqual(response.json()['results'], [dict(item, category=dict(item['category'])) for item in expected])
+
+    def test_list_paginates(self):
+        for _ in range(3):
+            create_order(self.user)
+
+        response = self.client.get(ASYNC_ORDERS_URL, {'page_size': 2}, **self.headers)
+        next_page = self.client.get(response.json()['next'], **self.headers)
+
+        self.assertEqual(len(response.json()['results']), 2)
+        self.assertEqual(len(next_page.json()['results']), 1)
+
+    def test_retrieve_order(self):
+        order = create_order(self.user)
+
+        response = self.client.get(detail_url(order.id), **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['id'], OrderDetailSerializer(order).data['id'])
+        self.assertEqual(response.json()['description'], order.description)
+
+    def test_retrieve_other_users_order_returns_error(self):
+        other_user = get_user_model().objects.create_user(email='other@example.com', password='tests123')
+        order = create_order(other_user)
+
+        response = self.client.get(detail_url(order.id), **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_only_get_is_allowed(self):
+        response = self.client.post(ASYNC_ORDERS_URL, {}, **self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_db_thread_queries_are_counted(self):
+        response = self.client.get(ASYNC_ORDERS_URL, **self.headers)
+
+        # Token lookup, count and page, all run on the async-db executor
+        self.assertEqual(response['X-DB-Query-Count'], '3')
+
+    async def test_async_middleware_counts_queries(self):
+        # The ASGI request factory takes header names, not META keys
+        headers = {'authorization': f'Token {self.token.key}'}
+        # A sync view runs in a thread of its own, the token lookup is its query
+        sync_view_response = await self.async_client.get(reverse('user:me'), **headers)
+        # The token is cached by now, the count and the page are read on the
+        # async-db executor
+        response = await self.async_client.get(ASYNC_ORDERS_URL, **headers)
+
+        self.assertEqual(sync_view_response['X-DB-Query-Count'], '1')
+        self.assertEqual(response['X-DB-Query-Count'], '2')
+
+    async def test_health_check(self):
+        response = await self.async_client.get(HEALTH_CHECK_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from core.models import Category, Order
+from order.filters import OrderFilter
+
+USERS = 50
+ORDERS_PER_USER = 400
+
+
+class OrderFilterPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f'user{index}@example.com') for index in range(USERS)
+        )
+        categories = Category.objects.bulk_create(Category(name=f'Category {index}') for index in range(20))
+        Order.objects.bulk_create(
+            (
+                Order(
+                    user=user,
+                    contact_name=f'Contact {index}',
+                    contact_phone=f'+55839{index:08d}',
+                    description='Description',
+                    real_state_agency=f'Agency {index % 40}',
+                    company=f'Company {index % 100}',
+                    deadline=date(2030, 1, 1) + timedelta(days=index % 365),
+                    category=categories[index % len(categories)],
+                )
+                for user in users
+                for index in range(ORDERS_PER_USER)
+            ),
+            batch_size=2000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_order')
+            cursor.execute('ANALYZE core_category')
+
+        cls.user = users[0]
+
+    def explain(self, **params):
+        request = Request(APIRequestFactory().get('/', params))
+        queryset = OrderFilter().filter_queryset(request, Order.objects.filter(user=self.user), view=None)
+        return queryset.order_by('-id')[:51].explain()
+
+    def assertUsesIndex(self, plan, index):
+        self.assertIn(index, plan)
+        self.assertNotIn('Seq Scan on core_order', plan)
+
+    def test_deadline_range_uses_index(self):
+        plan = self.explain(deadline_after='2030-01-01', deadline_before='2030-01-07')
+
+        self.assertUsesIndex(plan, 'order_user_deadline_idx')
+
+    def test_category_uses_index(self):
+        category = Category.objects.get(name='Category 3')
+
+        self.assertUsesIndex(self.explain(category=category.id), 'order_user_category_idx')
+
+    def test_category_name_uses_index(self):
+        self.assertUsesIndex(self.explain(category_name='Category 3'), 'order_user_category_idx')
+
+    def test_company_uses_index(self):
+        self.assertUsesIndex(self.explain(company='Company 7'), 'order_user_company_idx')
+
+    def test_agency_uses_index(self):
+        self.assertUsesIndex(self.explain(real_state_agency='Agency 7'), 'order_user_agency_idx')
+
+    def test_phone_uses_index(self):
+        self.assertUsesIndex(self.explain(phone='55 839 0000 0042'), 'order_user_phone_idx')
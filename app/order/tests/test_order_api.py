@@ -1,16 +1,23 @@
-from datetime import date
+import base64
+import csv
+import io
+import json
+from datetime import date, timedelta
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from core.models import Order, Category
+from core.testing import QueryBudgetMixin
 from order.serializers import (
     OrderSerializer,
     OrderDetailSerializer,
 )
 
 ORDERS_URL = reverse('order:order-list')
+BULK_URL = reverse('order:order-bulk')
+EXPORT_URL = reverse('order:order-export')
 
 def detail_url(order_id):
     return reverse('order:order-detail', args=[order_id])
@@ -69,7 +76,7 @@ class PrivateOrderAPITests(TestCase):
         serializer = OrderSerializer(orders, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_orders_list_limited_to_user(self):
         other_user = create_user(
@@ -85,7 +92,7 @@ class PrivateOrderAPITests(TestCase):
         serializer = OrderSerializer(orders, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_get_order_detail(self):
         order = create_order(user=self.user)
@@ -241,3 +248,452 @@ class PrivateOrderAPITests(TestCase):
         self.assertTrue(Order.objects.filter(id=order.id).exists())
 
 
+class OrderPaginationAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+        category = create_category()
+        self.orders = [
+            create_order(user=self.user, category=category, deadline=date(2025, 1, 1 + index % 3))
+            for index in range(7)
+        ]
+
+    def collect_pages(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(order['id'] for order in response.data['results'])
+            url = response.data['next']
+
+        return ids
+
+    def test_pages_follow_default_ordering(self):
+        ids = self.collect_pages(f'{ORDERS_URL}?page_size=3')
+
+        expected = [order.id for order in sorted(self.orders, key=lambda order: -order.id)]
+        self.assertEqual(ids, expected)
+
+    def test_pages_follow_deadline_ordering(self):
+        ids = self.collect_pages(f'{ORDERS_URL}?page_size=2&ordering=deadline')
+
+        expected = [order.id for order in sorted(self.orders, key=lambda order: (order.deadline, order.id))]
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        first_page = self.client.get(f'{ORDERS_URL}?page_size=3')
+        second_page = self.client.get(first_page.data['next'])
+
+        response = self.client.get(second_page.data['previous'])
+
+        self.assertEqual(response.data['results'], first_page.data['results'])
+        self.assertIsNone(first_page.data['previous'])
+
+    def test_last_page_has_no_next_link(self):
+        response = self.client.get(f'{ORDERS_URL}?page_size=7')
+
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor_returns_error(self):
+        response = self.client.get(f'{ORDERS_URL}?cursor=invalid')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_wrong_value_types_returns_error(self):
+        cursors = [
+            ('-id', {'p': ['abc']}),
+            ('-id', {'p': [[1]]}),
+            ('-id', {'p': [None]}),
+            ('deadline', {'p': ['notadate', 1]}),
+            ('deadline', {'p': ['2025-01-01', {'id': 1}]}),
+        ]
+        for ordering, cursor in cursors:
+            encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+            with self.subTest(ordering=ordering, cursor=cursor):
+                response = self.client.get(ORDERS_URL, {'ordering': ordering, 'cursor': encoded})
+
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unsupported_ordering_returns_error(self):
+        response = self.client.get(f'{ORDERS_URL}?ordering=company')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrderQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+
+    def create_orders(self, count):
+        for index in range(count):
+            create_order(user=self.user, category=create_category(name=f'Category {index}'))
+
+    def test_list_runs_constant_queries(self):
+        self.assertConstantQueries(lambda: self.client.get(ORDERS_URL), self.create_orders, sizes=(1, 10))
+
+    def test_retrieve_runs_single_query(self):
+        order = create_order(user=self.user)
+
+        with self.assertMaxQueries(1):
+            self.client.get(detail_url(order.id))
+
+    def test_create_within_budget(self):
+        payload = {
+            'contact_name': 'Contactor',
+            'contact_phone': '839913324234',
+            'description': 'Descripciones',
+            'real_state_agency': 'Sigma',
+            'company': 'Arasaka',
+            'deadline': date.today(),
+            'category': {'name': 'Truck'},
+        }
+
+        with self.assertMaxQueries(6):
+            response = self.client.post(ORDERS_URL, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update_within_budget(self):
+        order = create_order(user=self.user)
+
+        with self.assertMaxQueries(6):
+            response = self.client.patch(detail_url(order.id), {'category': {'name': 'Cargo'}}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BulkOrderAPITests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+
+    def order_payload(self, **params):
+        payload = {
+            'contact_name': 'Contactor',
+            'contact_phone': '839913324234',
+            'description': 'Descripciones',
+            'real_state_agency': 'Sigma',
+            'company': 'Arasaka',
+            'deadline': date.today() + timedelta(days=30),
+            'category': {'name': 'Truck'},
+        }
+        payload.update(params)
+
+        return payload
+
+    def test_bulk_create_orders(self):
+        create_category(name='Truck')
+        payload = [
+            self.order_payload(),
+            self.order_payload(company='Militech', category={'name': 'Cargo'}),
+            self.order_payload(category={'name': 'Cargo'}),
+        ]
+
+        response = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        orders = Order.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([order.company for order in orders], ['Arasaka', 'Militech', 'Arasaka'])
+        self.assertEqual([order.category.name for order in orders], ['Truck', 'Cargo', 'Cargo'])
+        self.assertEqual(Category.objects.filter(name='Cargo').count(), 1)
+        self.assertEqual([item['id'] for item in response.data], [order.id for order in orders])
+
+    def test_bulk_create_runs_constant_queries(self):
+        payload = [self.order_payload(category={'name': f'Category {index % 5}'}) for index in range(50)]
+
+        with self.assertMaxQueries(6):
+            self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 50)
+
+    @override_settings(ORDER_BULK_BATCH_SIZE=10)
+    def test_bulk_create_inserts_in_batches(self):
+        payload = [self.order_payload() for _ in range(25)]
+
+        with self.assertMaxQueries(10) as counter:
+            self.client.post(BULK_URL, payload, format='json')
+
+        inserts = [sql for sql in counter.statements if sql.startswith('INSERT INTO "core_order"')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_bulk_create_reports_item_errors(self):
+        payload = [
+            self.order_payload(),
+            self.order_payload(contact_phone='invalid phone'),
+            self.order_payload(deadline=date.today() - timedelta(days=1)),
+        ]
+
+        response = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('contact_phone', response.data[1])
+        self.assertIn('deadline', response.data[2])
+        self.assertFalse(Order.objects.exists())
+
+    @override_settings(ORDER_BULK_MAX_ITEMS=2)
+    def test_bulk_create_rejects_too_many_items(self):
+        payload = [self.order_payload() for _ in range(3)]
+
+        response = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_bulk_create_rejects_empty_list(self):
+        response = self.client.post(BULK_URL, [], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ExportOrderAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+
+    def read_content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        orders = [create_order(user=self.user, company=f'Company {index}') for index in range(3)]
+        create_order(user=create_user(email='other@example.com', password='tests123'))
+
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in self.read_content(response).splitlines()]
+        expected = [dict(OrderDetailSerializer(order).data) for order in orders]
+        for line in expected:
+            line['category'] = dict(line['category'])
+        self.assertEqual(lines, expected)
+
+    def test_export_csv(self):
+        order = create_order(user=self.user, description='Line, with "quotes"')
+
+        response = self.client.get(EXPORT_URL, {'type': 'csv'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(self.read_content(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], str(order.id))
+        self.assertEqual(rows[0]['category_name'], order.category.name)
+        self.assertEqual(rows[0]['description'], order.description)
+
+    def test_export_runs_single_query(self):
+        for index in range(5):
+            create_order(user=self.user, category=create_category(name=f'Category {index}'))
+
+        response = self.client.get(EXPORT_URL)
+
+        with self.assertNumQueries(1):
+            self.read_content(response)
+
+    def test_export_unsupported_type_returns_error(self):
+        response = self.client.get(EXPORT_URL, {'type': 'xml'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalOrderAPITests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+        self.order = create_order(user=self.user)
+
+    def test_list_returns_not_modified_for_matching_etag(self):
+        response = self.client.get(ORDERS_URL)
+
+        with self.assertMaxQueries(2):
+            not_modified = self.client.get(ORDERS_URL, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertIn('Last-Modified', response)
+
+    def test_list_etag_changes_on_update(self):
+        etag = self.client.get(ORDERS_URL)['ETag']
+        self.client.patch(detail_url(self.order.id), {'company': 'Arasaka'}, format='json')
+
+        response = self.client.get(ORDERS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_on_delete(self):
+        create_order(user=self.user)
+        etag = self.client.get(ORDERS_URL)['ETag']
+        self.client.delete(detail_url(self.order.id))
+
+        response = self.client.get(ORDERS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_on_category_rename(self):
+        etag = self.client.get(ORDERS_URL)['ETag']
+        self.order.category.name = 'Renamed'
+        self.order.category.save()
+
+        response = self.client.get(ORDERS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_returns_not_modified_for_matching_etag(self):
+        response = self.client.get(detail_url(self.order.id))
+
+        not_modified = self.client.get(detail_url(self.order.id), HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_returns_not_modified_since_last_modified(self):
+        response = self.client.get(detail_url(self.order.id))
+
+        not_modified = self.client.get(detail_url(self.order.id), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_etag_changes_on_update(self):
+        etag = self.client.get(detail_url(self.order.id))['ETag']
+        self.client.patch(detail_url(self.order.id), {'company': 'Arasaka'}, format='json')
+
+        response = self.client.get(detail_url(self.order.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['company'], 'Arasaka')
+
+
+class OrderSearchAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+        self.category = create_category()
+
+    def search(self, terms, **params):
+        response = self.client.get(ORDERS_URL, {'search': terms, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_search_matches_indexed_fields(self):
+        by_description = create_order(user=self.user, category=self.category, description='Fragile glass panels')
+        by_company = create_order(user=self.user, category=self.category, company='Glass Works')
+        create_order(user=self.user, category=self.category)
+
+        response = self.search('glass')
+
+        self.assertEqual({order['id'] for order in response.data['results']}, {by_description.id, by_company.id})
+
+    def test_search_ranks_stronger_matches_first(self):
+        weak = create_order(user=self.user, category=self.category, description='Arasaka parts')
+        strong = create_order(user=self.user, category=self.category, company='Arasaka', contact_name='Arasaka')
+
+        response = self.search('arasaka')
+
+        self.assertEqual([order['id'] for order in response.data['results']], [strong.id, weak.id])
+
+    def test_search_limited_to_user(self):
+        other_user = create_user(email='other@example.com', password='tests123')
+        create_order(user=other_user, category=self.category, company='Arasaka')
+
+        response = self.search('arasaka')
+
+        self.assertEqual(response.data['results'], [])
+
+    def test_search_is_updated_on_write(self):
+        order = create_order(user=self.user, category=self.category)
+        self.client.patch(detail_url(order.id), {'company': 'Militech'}, format='json')
+
+        self.assertEqual(len(self.search('militech').data['results']), 1)
+        self.assertEqual(self.search('sato').data['results'], [])
+
+    def test_search_pages_follow_rank(self):
+        orders = [
+            create_order(user=self.user, category=self.category, description='cargo ' * (index + 1))
+            for index in range(5)
+        ]
+
+        ids = []
+        url = f'{ORDERS_URL}?search=cargo&page_size=2'
+        while url:
+            response = self.client.get(url)
+            ids.extend(order['id'] for order in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(ids, [order.id for order in reversed(orders)])
+
+    def test_search_pages_with_tied_ranks(self):
+        orders = [create_order(user=self.user, category=self.category, description='cargo') for _ in range(7)]
+
+        ids = []
+        url = f'{ORDERS_URL}?search=cargo&page_size=3'
+        # A cursor rank that does not round-trip would return the same page forever
+        for _ in range(len(orders)):
+            if not url:
+                break
+            response = self.client.get(url)
+            ids.extend(order['id'] for order in response.data['results'])
+            url = response.data['next']
+
+        self.assertIsNone(url)
+        self.assertEqual(ids, sorted((order.id for order in orders), reverse=True))
+
+    def test_rank_ordering_requires_search(self):
+        response = self.client.get(ORDERS_URL, {'ordering': '-rank'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrderFilterAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+        self.truck = create_category(name='Truck')
+        self.cargo = create_category(name='Cargo')
+        self.early = create_order(user=self.user, category=self.truck, deadline=date(2030, 1, 1),
+                                  company='Arasaka', contact_phone='+5583991382914')
+        self.late = create_order(user=self.user, category=self.cargo, deadline=date(2030, 3, 1),
+                                 real_state_agency='Sigma', contact_phone='5583991380000')
+
+    def filter_ids(self, **params):
+        response = self.client.get(ORDERS_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [order['id'] for order in response.data['results']]
+
+    def test_filter_by_deadline_range(self):
+        self.assertEqual(self.filter_ids(deadline_after='2030-02-01'), [self.late.id])
+        self.assertEqual(self.filter_ids(deadline_before='2030-01-01'), [self.early.id])
+
+    def test_filter_by_category(self):
+        self.assertEqual(self.filter_ids(category=self.cargo.id), [self.late.id])
+        self.assertEqual(self.filter_ids(category_name='Truck'), [self.early.id])
+
+    def test_filter_by_company_and_agency(self):
+        self.assertEqual(self.filter_ids(company='Arasaka'), [self.early.id])
+        self.assertEqual(self.filter_ids(real_state_agency='Sigma'), [self.late.id])
+
+    def test_filter_by_normalized_phone(self):
+        self.assertEqual(self.filter_ids(phone='55 83 99138-2914'), [self.early.id])
+        self.assertEqual(self.filter_ids(phone='+5583991380000'), [self.late.id])
+
+    def test_filters_combine(self):
+        self.assertEqual(self.filter_ids(category=self.truck.id, company='Sato Company'), [])
+
+    def test_filters_limited_to_user(self):
+        other_user = create_user(email='other@example.com', password='tests123')
+        create_order(user=other_user, category=self.truck, company='Arasaka')
+
+        self.assertEqual(self.filter_ids(company='Arasaka'), [self.early.id])
+
+    def test_invalid_filter_returns_error(self):
+        response = self.client.get(ORDERS_URL, {'deadline_after': 'tomorrow', 'category': 'x'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {'deadline_after', 'category'})
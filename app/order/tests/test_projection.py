@@ -0,0 +1,64 @@
+import io
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.models import Category, Order
+from order.projection import project_orders, represent_orders
+from order.serializers import OrderSerializer
+
+ORDERS_URL = reverse('order:order-list')
+
+
+class OrderProjectionTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='tests123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        categories = [Category.objects.create(name=name) for name in ('Truck', 'Caminhão ✓')]
+        for index in range(6):
+            Order.objects.create(
+                user=self.user,
+                contact_name=f'Contact "{index}"',
+                contact_phone='+5583991382914',
+                description='Description',
+                real_state_agency='Agência',
+                company=f'Company {index}',
+                deadline=date(2030, 1, 1 + index),
+                category=categories[index % 2],
+            )
+
+    def test_output_matches_serializer_bytes(self):
+        queryset = Order.objects.filter(user=self.user).order_by('-id')
+
+        projected = JSONRenderer().render(represent_orders(project_orders(queryset)))
+        serialized = JSONRenderer().render(OrderSerializer(queryset, many=True).data)
+
+        self.assertEqual(projected, serialized)
+
+    def test_list_matches_serializer_list(self):
+        response = self.client.get(ORDERS_URL, {'page_size': 4, 'ordering': 'deadline'})
+        with override_settings(ORDER_LIST_PROJECTION=False):
+            expected = self.client.get(ORDERS_URL, {'page_size': 4, 'ordering': 'deadline'})
+
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(self.client.get(response.data['next']).content, self.client.get(expected.data['next']).content)
+
+    def test_list_runs_single_query_for_rows(self):
+        # Validators, maintained count, then the page itself
+        with self.assertNumQueries(3):
+            self.client.get(ORDERS_URL)
+
+
+class BenchmarkOrderListCommandTests(TestCase):
+    def test_reports_both_paths_and_rolls_back(self):
+        output = io.StringIO()
+
+        call_command('benchmark_order_list', sizes=[5], repeat=1, stdout=output, stderr=output)
+
+        self.assertIn('projection', output.getvalue())
+        self.assertNotIn('differs', output.getvalue())
+        self.assertFalse(Order.objects.exists())
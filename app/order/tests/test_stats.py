@@ -0,0 +1,166 @@
+import io
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import Category, Order, OrderStat
+from order.stats import find_inconsistencies, order_count
+
+STATS_URL = reverse('order:order-stats')
+
+
+def create_order(user, category, **params):
+    defaults = {
+        'contact_name': 'Contact Name',
+        'contact_phone': '839913829147',
+        'description': 'Test description',
+        'real_state_agency': 'Sigma',
+        'company': 'Arasaka',
+        'deadline': date(2030, 1, 2),
+    }
+    defaults.update(params)
+
+    return Order.objects.create(user=user, category=category, **defaults)
+
+
+class OrderStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+        self.truck = Category.objects.create(name='Truck')
+        self.cargo = Category.objects.create(name='Cargo')
+
+    def assertConsistent(self):
+        self.assertEqual(find_inconsistencies(), [])
+
+    def test_stats_endpoint(self):
+        create_order(self.user, self.truck, deadline=date(2030, 1, 2))
+        create_order(self.user, self.truck, deadline=date(2030, 1, 3), company='Militech')
+        create_order(self.user, self.cargo, deadline=date(2030, 1, 9))
+
+        with self.assertNumQueries(2):
+            response = self.client.get(STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'total': 3,
+            'by_category': [
+                {'id': self.truck.id, 'name': 'Truck', 'count': 2},
+                {'id': self.cargo.id, 'name': 'Cargo', 'count': 1},
+            ],
+            'by_deadline_week': [
+                {'week': '2029-12-31', 'count': 2},
+                {'week': '2030-01-07', 'count': 1},
+            ],
+            'by_company': [
+                {'company': 'Arasaka', 'count': 2},
+                {'company': 'Militech', 'count': 1},
+            ],
+        })
+
+    def test_stats_limited_to_user(self):
+        other_user = get_user_model().objects.create_user(email='other@example.com', password='tests123')
+        create_order(other_user, self.truck)
+
+        response = self.client.get(STATS_URL)
+
+        self.assertEqual(response.data['total'], 0)
+
+    def test_update_moves_counts(self):
+        order = create_order(self.user, self.truck)
+        order.company = 'Militech'
+        order.category = self.cargo
+        order.save()
+
+        self.assertFalse(OrderStat.objects.filter(dimension=OrderStat.COMPANY, key='Arasaka').exists())
+        self.assertConsistent()
+
+    def test_bulk_writes_are_counted(self):
+        Order.objects.bulk_create([
+            Order(user=self.user, category=self.truck, contact_name='Name', contact_phone='839913829147',
+                  description='Description', real_state_agency='Sigma', company=f'Company {index % 2}',
+                  deadline=date(2030, 1, 1 + index))
+            for index in range(10)
+        ])
+        Order.objects.filter(company='Company 0').update(category=self.cargo)
+        Order.objects.filter(company='Company 1')[:1].get().delete()
+
+        self.assertConsistent()
+        self.assertEqual(self.client.get(STATS_URL).data['total'], 9)
+
+    def test_category_cascade_is_counted(self):
+        create_order(self.user, self.truck)
+        create_order(self.user, self.cargo)
+
+        self.truck.delete()
+
+        self.assertConsistent()
+        self.assertEqual(self.client.get(STATS_URL).data['by_category'], [
+            {'id': self.cargo.id, 'name': 'Cargo', 'count': 1},
+        ])
+
+    def test_user_cascade_removes_rollup(self):
+        create_order(self.user, self.truck)
+
+        self.user.delete()
+
+        self.assertFalse(OrderStat.objects.exists())
+
+    def test_check_command_reports_drift(self):
+        create_order(self.user, self.truck)
+        OrderStat.objects.filter(dimension=OrderStat.COMPANY).update(count=5)
+
+        with self.assertRaises(CommandError):
+            call_command('order_stats', check=True, stdout=io.StringIO())
+
+    def test_rebuild_command_fixes_drift(self):
+        create_order(self.user, self.truck)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {OrderStat._meta.db_table}')
+
+        call_command('order_stats', stdout=io.StringIO())
+
+        self.assertConsistent()
+        self.assertEqual(OrderStat.objects.count(), 4)
+
+
+class OrderCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(email='user@example.com', password='tests123')
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(name='Truck')
+
+    def test_list_reports_maintained_count(self):
+        for _ in range(3):
+            create_order(self.user, self.category)
+
+        response = self.client.get(reverse('order:order-list'), {'page_size': 1})
+
+        self.assertEqual(response.data['count'], 3)
+
+    def test_count_follows_deletes(self):
+        orders = [create_order(self.user, self.category) for _ in range(2)]
+        orders[0].delete()
+
+        self.assertEqual(order_count(self.user), 1)
+
+    def test_filtered_list_has_no_count(self):
+        create_order(self.user, self.category)
+
+        response = self.client.get(reverse('order:order-list'), {'company': 'Arasaka'})
+
+        self.assertIsNone(response.data['count'])
+
+    def test_count_does_not_scan_orders(self):
+        create_order(self.user, self.category)
+
+        with self.assertNumQueries(1) as context:
+            order_count(self.user)
+
+        self.assertNotIn('core_order"', context.captured_queries[0]['sql'])
@@ -3,7 +3,7 @@ from django.urls import (
     include
 )
 from rest_framework.routers import DefaultRouter
-from order import views
+from order import async_views, views
 
 router = DefaultRouter()
 router.register('orders', views.OrderViewSet)
@@ -11,5 +11,7 @@ router.register('orders', views.OrderViewSet)
 app_name = 'order'
 
 urlpatterns = [
+    path('async/orders/', async_views.order_list, name='async-order-list'),
+    path('async/orders/<int:pk>/', async_views.order_detail, name='async-order-detail'),
     path('', include(router.urls))
 ]
\ No newline at end of file
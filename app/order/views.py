@@ -1,17 +1,34 @@
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from core.models import Order
 from order import serializers
+from order.conditional import conditional_response, list_validators, object_validators, set_validators
+from order.export import FORMATS, export_orders
+from order.filters import OrderFilter, OrderSearchFilter
+from order.pagination import KeysetPagination
+from order.projection import project_orders, represent_orders
+from order.stats import order_count, user_stats
+from user.authentication import CachedTokenAuthentication
 
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = serializers.OrderDetailSerializer
     queryset = Order.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = [OrderFilter, OrderSearchFilter]
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-id')
+        # search_vector is only read by the search filter, in SQL
+        queryset = self.queryset.filter(user=self.request.user).defer('search_vector')
+        return queryset.select_related('category').order_by('-id')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -20,4 +37,63 @@ class OrderViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data, many=True, allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=self.request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        parameters=[OpenApiParameter('type', enum=list(FORMATS), default='ndjson')],
+        responses={200: OpenApiTypes.BINARY},
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in FORMATS:
+            raise ValidationError({'type': 'Supported values are: %s.' % ', '.join(FORMATS)})
+
+        content, content_type = export_orders(self.get_queryset(), export_format)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="orders.{export_format}"'
+        return response
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        return Response(user_stats(request.user))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        count = order_count(request.user)
+        # Deletions do not move the newest updated_at, so only the ETag, which
+        # also covers the row count, can answer a conditional list request
+        etag, last_modified = list_validators(request, queryset, count)
+        not_modified = conditional_response(request, etag, last_modified, use_last_modified=False)
+        if not_modified is not None:
+            return not_modified
+
+        filtered = self.filter_queryset(queryset)
+        # Filter backends hand back the same queryset when no filter applies
+        self.paginator.count = count if filtered is queryset else None
+        if settings.ORDER_LIST_PROJECTION:
+            page = self.paginate_queryset(project_orders(filtered))
+            response = self.get_paginated_response(represent_orders(page))
+        else:
+            page = self.paginate_queryset(filtered)
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+        return set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = object_validators(request, instance)
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
\ No newline at end of file
@@ -0,0 +1,41 @@
+import copy
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from core.cache import TTLCache, is_process_local
+from core.profiling import measure
+
+tokens = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_LOCAL_TTL)
+
+
+def cache_key(key):
+    return f'auth:token:{key}'
+
+
+def shared_ttl():
+    # invalidate() only reaches this process when the cache is not shared,
+    # other processes must not keep a revoked token any longer than locally
+    return settings.AUTH_CACHE_LOCAL_TTL if is_process_local() else settings.AUTH_CACHE_TTL
+
+
+def invalidate(key):
+    tokens.delete(key)
+    cache.delete(cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate(self, request):
+        with measure('auth'):
+            return super().authenticate(request)
+
+    def authenticate_credentials(self, key):
+        token = tokens.get(key)
+        if token is None:
+            token = cache.get(cache_key(key))
+            if token is None:
+                _, token = super().authenticate_credentials(key)
+                cache.set(cache_key(key), token, shared_ttl())
+            tokens.set(key, token)
+
+        # Views may mutate request.user, keep the cached instance untouched
+        return (copy.copy(token.user), token)
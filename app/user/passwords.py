@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.db import connection
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from core import metrics
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Too many logins in progress, try again shortly.')
+    default_code = 'hashing_unavailable'
+    wait = 1
+
+
+class PasswordVerifier:
+    """
+    Runs password hashing on a small per-process pool. Admission is counted
+    across every server process with PostgreSQL advisory locks, one per slot,
+    so a burst of logins beyond the slots is refused instead of occupying
+    every request worker.
+    """
+    # First key of the advisory locks, the second one is the slot number
+    lock_class = int.from_bytes(b'hash', 'big')
+
+    def __init__(self, workers):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hasher')
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    def run(self, function, *args):
+        slot = self.acquire()
+        if slot is None:
+            with self.lock:
+                self.rejected += 1
+            metrics.LOGIN_HASH_REJECTED.inc()
+            raise HashingUnavailable()
+
+        submitted = time.perf_counter()
+
+        def task():
+            self.record_queue_time(time.perf_counter() - submitted)
+            return function(*args)
+
+        try:
+            return self.executor.submit(task).result()
+        finally:
+            self.release(slot)
+
+    def acquire(self):
+        # Session locks, held by this connection until released. The scan
+        # stops at the first slot it gets
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT slot FROM generate_series(1, %s) AS slot WHERE pg_try_advisory_lock(%s, slot) LIMIT 1',
+                [settings.LOGIN_HASH_SLOTS, self.lock_class],
+            )
+            row = cursor.fetchone()
+
+        return row[0] if row else None
+
+    def release(self, slot):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s, %s)', [self.lock_class, slot])
+
+    def record_queue_time(self, queue_time):
+        with self.lock:
+            self.completed += 1
+            self.queue_time_total += queue_time
+            self.queue_time_max = max(self.queue_time_max, queue_time)
+        metrics.LOGIN_HASH_QUEUE_TIME.observe(queue_time)
+
+
+verifier = PasswordVerifier(settings.LOGIN_HASH_WORKERS)
+
+
+def needs_rehash(encoded):
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def authenticate(request, email, password):
+    UserModel = get_user_model()
+    try:
+        user = UserModel._default_manager.get_by_natural_key(email)
+    except UserModel.DoesNotExist:
+        # Hash anyway so unknown emails cost as much as wrong passwords
+        verifier.run(make_password, password)
+        user = None
+    else:
+        if not verifier.run(check_password, password, user.password) or not user.is_active:
+            user = None
+        elif needs_rehash(user.password):
+            user.password = verifier.run(make_password, password)
+            user.save(update_fields=['password'])
+
+    if user is None:
+        user_login_failed.send(sender=__name__, credentials={'username': email}, request=request)
+
+    return user
@@ -1,10 +1,8 @@
-from django.contrib.auth import (
-    get_user_model,
-    authenticate
-)
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext as _
 
 from rest_framework import serializers
+from user.passwords import authenticate
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -37,7 +35,7 @@ class AuthTokenSerializer(serializers.Serializer):
         password = attrs.get('password')
         user = authenticate(
             request=self.context.get('request'),
-            username=email,
+            email=email,
             password=password,
         )
 
@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from user import authentication
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(instance, **kwargs):
+    authentication.invalidate(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens(instance, created, **kwargs):
+    if created:
+        return
+
+    for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+        authentication.invalidate(key)
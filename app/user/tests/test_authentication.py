@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from user import authentication
+
+ME_URL = reverse('user:me')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        authentication.tokens.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_token_lookup_is_cached(self):
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], self.user.email)
+
+    def test_shared_cache_serves_other_processes(self):
+        self.client.get(ME_URL)
+        authentication.tokens.clear()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(AUTH_CACHE_TTL=300, AUTH_CACHE_LOCAL_TTL=5)
+    def test_process_local_cache_keeps_tokens_for_local_ttl(self):
+        with patch('user.authentication.cache.set', wraps=cache.set) as cache_set:
+            self.client.get(ME_URL)
+
+        cache_set.assert_called_once_with(authentication.cache_key(self.token.key), self.token, 5)
+
+    @override_settings(
+        AUTH_CACHE_TTL=300, AUTH_CACHE_LOCAL_TTL=5,
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+    )
+    def test_shared_cache_keeps_tokens_for_shared_ttl(self):
+        with patch('user.authentication.cache.set') as cache_set:
+            self.client.get(ME_URL)
+
+        cache_set.assert_called_once_with(authentication.cache_key(self.token.key), self.token, 300)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_refreshes_cached_user(self):
+        self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {'name': 'Updated'})
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.data['name'], 'Updated')
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
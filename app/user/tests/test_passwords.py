@@ -0,0 +1,120 @@
+import threading
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+from user import passwords
+
+TOKEN_URL = reverse('user:token')
+
+
+def sample(name):
+    return REGISTRY.get_sample_value(name) or 0
+
+
+class PasswordVerificationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.payload = {'email': 'test@example.com', 'password': 'testpass123'}
+
+    def test_hashing_runs_off_request_thread(self):
+        threads = []
+        original = passwords.check_password
+
+        def check_password(*args):
+            threads.append(threading.current_thread().name)
+            return original(*args)
+
+        with patch('user.passwords.check_password', check_password):
+            response = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(threads[0].startswith('password-hasher'))
+
+    def test_queue_time_is_recorded(self):
+        completed = passwords.verifier.completed
+        observed = sample('login_hash_queue_seconds_count')
+
+        self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(passwords.verifier.completed, completed + 1)
+        self.assertGreaterEqual(passwords.verifier.queue_time_max, 0)
+        self.assertEqual(sample('login_hash_queue_seconds_count'), observed + 1)
+
+    def test_inactive_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_email_is_rejected(self):
+        response = self.client.post(TOKEN_URL, {'email': 'other@example.com', 'password': 'testpass123'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    ])
+    def test_outdated_hash_is_upgraded(self):
+        self.client.post(TOKEN_URL, self.payload)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('md5$'))
+        self.assertTrue(self.user.check_password('testpass123'))
+
+
+@override_settings(LOGIN_HASH_SLOTS=1)
+class HashingAdmissionTests(TransactionTestCase):
+    def setUp(self):
+        get_user_model().objects.create_user(email='test@example.com', password='testpass123')
+        self.payload = {'email': 'test@example.com', 'password': 'testpass123'}
+
+    def test_logins_beyond_slots_return_service_unavailable(self):
+        rejected = passwords.verifier.rejected
+        exported = sample('login_hash_rejected_total')
+        hashing = threading.Event()
+        finish = threading.Event()
+        original = passwords.check_password
+        responses = []
+
+        def check_password(*args):
+            hashing.set()
+            finish.wait(timeout=10)
+            return original(*args)
+
+        def login():
+            # Its own database connection holds the slot, as another process would
+            try:
+                responses.append(APIClient().post(TOKEN_URL, self.payload))
+            finally:
+                connections.close_all()
+
+        with patch('user.passwords.check_password', check_password):
+            first = threading.Thread(target=login)
+            first.start()
+            self.assertTrue(hashing.wait(timeout=10))
+
+            second = APIClient().post(TOKEN_URL, self.payload)
+            finish.set()
+            first.join()
+
+        self.assertEqual(second.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(second['Retry-After'], '1')
+        self.assertEqual(responses[0].status_code, status.HTTP_200_OK)
+        self.assertEqual(passwords.verifier.rejected, rejected + 1)
+        self.assertEqual(sample('login_hash_rejected_total'), exported + 1)
+
+        # The slot is released once the first login is done
+        response = APIClient().post(TOKEN_URL, self.payload)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
+from core.testing import QueryBudgetMixin
 
 
 CREATE_USER_URL = reverse('user:create')
@@ -130,4 +131,39 @@ class PrivateUserApiTests(TestCase):
         self.user.refresh_from_db()
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class UserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name'
+        )
+
+    def test_create_user_within_budget(self):
+        payload = {
+            'email': 'new@example.com',
+            'password': 'testpass123',
+            'name': 'New Name'
+        }
+
+        with self.assertMaxQueries(2):
+            response = self.client.post(CREATE_USER_URL, payload)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_create_token_within_budget(self):
+        payload = {'email': 'test@example.com', 'password': 'testpass123'}
+
+        # Two of them take and release the hashing slot
+        with self.assertMaxQueries(7):
+            response = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_profile_runs_no_queries(self):
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertMaxQueries(0):
+            self.client.get(ME_URL)